@@ -15,7 +15,8 @@ import os
 from importlib import import_module
 
 from flask import Flask
-from .custom import shelve
+from . import storage
+from .utils import close_shelve
 from .custom.assets import Bundle, Environment
 
 from .quizzes import quiz_modules
@@ -33,16 +34,92 @@ from .quizzes import quiz_modules
 #       built-in 'shelves' module for use with the Flask web
 #       framework and provides a locking mechanism over the pickled
 #       data file. Hence, this is why it is used for storage.
+#
+#       The single lock does however become the bottleneck with lots
+#       of users, so other backends (see the `storage` package) can
+#       be selected with `STORAGE_BACKEND`.
 
 # ~~~~ Configuration ~~~~
 
+# Storage backend: 'shelve', 'sharded', 'sqlite' or 'memory'.
+STORAGE_BACKEND = 'shelve'
+
 # Data filename.
 SHELVE_FILENAME = 'complexity.bin'
-SHELVE_PROTOCOL = 1
+SHELVE_PROTOCOL = 2
+
+# Number of files quiz instances are spread across by the 'sharded'
+# backend.
+SHELVE_SHARDS = 8
+
+# Database filename for the 'sqlite' backend.
+SQLITE_FILENAME = 'complexity.sqlite'
+
+# Seconds between attempts to take a storage lock that's held by
+# another request, sleeping in between, instead of blocking until
+# it's free. Async workers need this to handle other requests while
+# one waits, so they use `ASYNC_LOCK_POLL` when it's not set.
+STORAGE_LOCK_POLL = None
+ASYNC_LOCK_POLL = 0.005
+
+# Store quiz instances in the (signed) quiz cookie instead of the
+# storage, so `_next` needs no storage at all. The storage is then
+# only used for records.
+# NOTE: The cookie is signed so it can't be forged, but a user could
+#       send an older cookie back to have another go at a question.
+QUIZ_STATE_COOKIE = False
+
+# Seconds a quiz instance is kept after it was last used. Reading it
+# only saves it again (extending it) once over half has gone. Expired
+# instances are removed with `complexity-sweep`.
+QUIZ_INSTANCE_TTL = 2 * 60 * 60
+
+# Number of records on each page of a quiz's records.
+RECORDS_PER_PAGE = 20
+
+# Address `complexity-serve` listens on.
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 5000
+
+# Worker processes `complexity-serve` starts, and the threads each
+# worker handles requests with. The 'memory' backend can only be
+# used with a single worker.
+# NOTE: Workers need Gunicorn (the 'serve' extra), otherwise a single
+#       process is served.
+SERVE_WORKERS = 2
+SERVE_THREADS = 4
+
+# Create the application before starting the workers, so they share
+# its memory and start quicker.
+SERVE_PRELOAD = True
+
+# Handle requests with gevent's green threads, so each worker can
+# wait on thousands of requests (`SERVE_CONNECTIONS`) at once. Needs
+# Gunicorn and gevent (the 'async' extra).
+SERVE_ASYNC = False
+SERVE_CONNECTIONS = 1000
+
+# Seconds workers get to finish their requests when restarting or
+# stopping.
+SERVE_GRACEFUL_TIMEOUT = 30
 
 # Assets.
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), 'assets')
 
+# Bundles are named by a hash of their contents, kept in a manifest
+# (in the static folder) when they're built.
+ASSETS_VERSIONS = 'hash'
+ASSETS_MANIFEST = 'json:assets-manifest.json'
+
+# Build bundles when they're first used in each process, compiling
+# LESS and CoffeeScript. In production build them ahead of time with
+# `complexity-build-assets` and set this to False, so only the
+# manifest is read.
+ASSETS_AUTO_BUILD = True
+
+# Minify the CSS compiled by `lessc`.
+LESS_EXTRA_ARGS = ['--compress']
+
 # ~~~~~~~~~~~~~~~~~~~~~~~
 
 def create_app(**config):
@@ -63,12 +140,15 @@ def create_app(**config):
     # Add additional config.
     app.config.update(config) 
 
-    # The shelve.
-    shelve.init_app(app)
+    # The storage.
+    storage.init_app(app)
+    app.teardown_request(close_shelve)
 
     # Flask Assets.
     assets = Environment(app)
     setup_assets(assets)
+    if not assets.auto_build:
+        check_assets(assets)
     
     # Register blueprints and error handlers.
     import_module('.views', package=__name__).register_blueprints(app)
@@ -89,40 +169,109 @@ def setup_assets(assets):
         for path in ['less', 'coffee', 'bower_components']
     ]
 
-    # Register all javascript files.
+    # Each page only gets the bundles it uses. Every page gets the
+    # base bundles, quiz pages also get their quiz's bundle and load
+    # KaTeX once the page has (see 'quizzes/quiz.html'), so the other
+    # pages never download it.
+
+    # Scripts for every page.
     assets.register(
-        'js_all',
+        'js_base',
         Bundle(
             'jquery/dist/jquery.min.js',
-            'jquery-color/jquery.color.js',
             'bootstrap/dist/js/bootstrap.min.js',
-            'katex/build/katex.js',
-            output='all.js'
+            filters='rjsmin',
+            output='base.%(version)s.js'
         )
     )
 
-    # Register all styling.
+    # Styling for every page.
     assets.register(
-        'css_all',
+        'css_base',
         Bundle(
             'all.less',
-            'katex/static/katex.less',
             filters='less',
-            output='all.css',
+            output='base.%(version)s.css',
             depends=['**/*.less']
         )
     )
-    
+
+    # KaTeX, for the quiz pages to typeset maths.
+    assets.register(
+        'js_katex',
+        Bundle(
+            'katex/build/katex.js',
+            filters='rjsmin',
+            output='katex.%(version)s.js'
+        )
+    )
+    assets.register(
+        'css_katex',
+        Bundle(
+            'katex/static/katex.less',
+            filters='less',
+            output='katex.%(version)s.css',
+            depends=['katex/static/*.less']
+        )
+    )
+
     # Register CoffeeScript files for each quiz.
     for module in quiz_modules:
         assets.register(
             'quiz-' + module,
             Bundle(
+                'jquery-color/jquery.color.js',
                 Bundle(
                     'quizzes/{}.coffee'.format(module),
                     filters=['coffeescript']
                 ),
-                output='quiz-{}.js'.format(module)
+                filters='rjsmin',
+                output='quiz-{}.%(version)s.js'.format(module)
             )
         )
 
+def check_assets(assets):
+    """
+    Check every bundle has been built ahead of time (by
+    `build_assets`), as they won't be built when used.
+
+    :param assets: The assets environment instance.
+
+    :raises RuntimeError: When a bundle is missing from the manifest.
+    """
+    missing = [
+        bundle.output for bundle in assets
+        if assets.manifest.query(bundle, assets) is None
+    ]
+
+    if missing:
+        raise RuntimeError(
+            "Assets {} haven't been built, run "
+            "`complexity-build-assets`.".format(', '.join(missing))
+        )
+
+def build_assets(assets):
+    """
+    Compile, minify and hash every bundle, recording their versions
+    in the manifest, and precompress them.
+
+    :param assets: The assets environment instance.
+
+    :returns: A `list` of the files built.
+    """
+    from .views.static import precompress
+
+    built = []
+
+    for bundle in assets:
+        bundle.build(force=True)
+        output = bundle.output % dict(version=bundle.get_version())
+
+        built.append(output)
+        built.extend(
+            os.path.relpath(path, assets.directory)
+            for path in precompress(os.path.join(assets.directory, output))
+        )
+
+    return built
+
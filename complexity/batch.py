@@ -0,0 +1,367 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: batch.py
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Generate many of The Modulus's questions at once with NumPy,
+    only rendering the questions that are used.
+
+    Each question in a batch has its own seed and draws the same
+    numbers, in the same order, as the question does with
+    `seeded.SeededRandom`, so a batch's question is the same as
+    `question_type(seed)`.
+
+    NumPy is optional, it's only needed to generate batches.
+
+"""
+
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .maths import MathsConstant, MathsComplexNumber, operators
+from .maths.shared import shared_constant, shared_expression
+from .seeded import (MASK, SEED_MULTIPLIER, INDEX_MULTIPLIER,
+                     MIX_MULTIPLIERS, MIX_SHIFTS)
+
+# Number of steps either side of the answer wrong answers are chosen
+# from, the same as `MultipleChoiceQuestion`s.
+STEPS = 10
+
+def new_seeds(size):
+    """
+    :param size: Number of seeds.
+
+    :returns: A `list` of random seeds, like a question's own.
+    """
+    return [random.getrandbits(32) for _ in xrange(size)]
+
+
+class BatchRandom(object):
+    """
+    `seeded.SeededRandom` for many seeds at once, drawing a column of
+    numbers at a time.
+
+    :param seeds: Array of the seeds.
+    """
+    def __init__(self, seeds):
+        self.seeds = numpy.asarray(seeds, dtype=numpy.uint64)
+        self.index = 0
+
+    def draw(self):
+        """
+        :returns: An array of the next 64 bit word for each seed, the
+                  same as `seeded.draw`.
+        """
+        self.index += 1
+        word = self.seeds * numpy.uint64(SEED_MULTIPLIER) +\
+            numpy.uint64((self.index * INDEX_MULTIPLIER) & MASK)
+
+        for shift, multiplier in zip(MIX_SHIFTS, MIX_MULTIPLIERS):
+            word ^= word >> numpy.uint64(shift)
+            word *= numpy.uint64(multiplier)
+
+        return word ^ (word >> numpy.uint64(MIX_SHIFTS[-1]))
+
+    def below(self, stop):
+        """
+        :returns: An array of `int`s from 0 up to (not including)
+                  `stop`.
+        """
+        return (self.draw() % numpy.uint64(stop)).astype(numpy.int64)
+
+    def randrange(self, start, stop):
+        """
+        :returns: An array of `int`s like `SeededRandom.randrange`.
+        """
+        return start + self.below(stop - start)
+
+    def sample_indices(self, size, count):
+        """
+        :returns: An array of shape (len(`seeds`), `count`) of the
+                  indices `SeededRandom.sample` chooses from a
+                  population of `size`.
+        """
+        chosen = []
+        for taken in xrange(count):
+            index = self.below(size - taken)
+            # Shift past the chosen ones, in order.
+            for earlier in sorted_columns(chosen):
+                index += index >= earlier
+            chosen.append(index)
+
+        return numpy.column_stack(chosen)
+
+
+def sorted_columns(columns):
+    """
+    :returns: A `list` of `columns` sorted within each row.
+    """
+    if not columns:
+        return []
+
+    return list(numpy.sort(numpy.column_stack(columns), axis=1).T)
+
+def step_of(values, scale=1.0):
+    """
+    :param values: Array of the correct answers.
+    :param scale: Fraction of the answer each step is.
+
+    :returns: An array of the gap between possible answers, at least
+              1 (the same as `int(value * scale)` in the questions).
+    """
+    return numpy.maximum(numpy.trunc(values * scale).astype(int), 1)
+
+def wrong_values(random, values, scale=1.0):
+    """
+    `MultipleChoiceQuestion.wrong_values` for every question.
+
+    :param random: A `BatchRandom`.
+    :param values: Array of the correct answers.
+    :param scale: Fraction of the answer each step is.
+
+    :returns: An array of shape (len(`values`), 2) of wrong answers
+              for each question.
+    """
+    # The steps either side of the answer, without the answer.
+    steps = random.sample_indices(2 * STEPS - 1, 2) - STEPS
+    steps += steps >= 0
+    return values[:, None] + step_of(values, scale)[:, None] * steps
+
+def near_value(random, values, scale=1.0):
+    """
+    `MultipleChoiceQuestion.near_value` for every question.
+
+    :returns: An array of values near `values`.
+    """
+    steps = random.randrange(-STEPS, STEPS)
+    return values + step_of(values, scale) * steps
+
+
+class QuestionBatch(object):
+    """
+    A batch of questions, kept as arrays of numbers.
+
+    :param question_type: The question's class.
+    :param seeds: The seed for each question.
+
+    :raises RuntimeError: When NumPy is not installed.
+    """
+    def __init__(self, question_type, seeds):
+        if not self.available():
+            raise RuntimeError("NumPy is needed to generate batches.")
+
+        self.question_type = question_type
+        self.seeds = list(seeds)
+        # Rendered square roots by value, many answers share them.
+        self.square_roots = {}
+
+        random = BatchRandom(self.seeds)
+
+        # z = a + bj, w = c + dj
+        a, b, c, d = [random.randrange(1, 11) for _ in xrange(4)]
+        self.columns = dict(a=a, b=b, c=c, d=d)
+        self.generate(random, a, b, c, d)
+        self.columns['correct'] = numpy.column_stack([
+            random.below(3) for _ in xrange(3)
+        ])
+
+    @staticmethod
+    def available():
+        """
+        :returns: True if batches can be generated.
+        """
+        return numpy is not None
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def generate(self, random, a, b, c, d):
+        """
+        Add the answers to `self.columns`, drawing from `random` in
+        the same order as the question.
+
+        :param random: A `BatchRandom`.
+        :param a, b, c, d: Arrays for `z = a + bj` and `w = c + dj`.
+        """
+        raise NotImplementedError
+
+    def parts(self, row):
+        """
+        :param row: The question's values from `self.columns`.
+
+        :returns: A `list` of a question and rendered answers,
+                  correct first, for each part.
+        """
+        raise NotImplementedError
+
+    def square_root(self, value):
+        """
+        :returns: The square root of NumPy's `value` rendered.
+        """
+        value = int(value)
+        rendered = self.square_roots.get(value)
+        if rendered is None:
+            rendered = self.square_roots[value] = str(shared_expression(
+                shared_constant(value), operators.sqrt
+            ).render())
+        return rendered
+
+    def ask(self, index):
+        """
+        Render a question.
+
+        :param index: The question's index in the batch.
+
+        :returns: The whole question to be asked with data, the same
+                  as `MultipleChoiceQuestion.ask`.
+        """
+        row = {
+            name: column[index] for name, column in self.columns.items()
+        }
+
+        question = []
+        for part, correct in zip(self.parts(row), row['correct']):
+            expression, answers = part
+            answers = map(str, answers)
+
+            # Place the correct answer at its index.
+            answers.insert(int(correct), answers.pop(0))
+            question.append(
+                (expression.render(), answers, int(correct))
+            )
+
+        return dict(
+            data=dict(
+                z=complex_number(row['a'], row['b']),
+                w=complex_number(row['c'], row['d'])
+            ),
+            question=question
+        )
+
+    def question(self, index):
+        """
+        :param index: The question's index in the batch.
+
+        :returns: The question, already rendered (see
+                  `MultipleChoiceQuestion.prepared`).
+        """
+        asked = self.ask(index)
+        return self.question_type.prepared(
+            self.seeds[index], asked['data'], asked['question']
+        )
+
+
+class ProductBatch(QuestionBatch):
+    """
+    A batch of `ModulusProductQuestion`s.
+    """
+    def generate(self, random, a, b, c, d):
+        # zw = (ac - bd) + (ad + cb)j
+        zw_re = a*c - b*d
+        zw_im = a*d + c*b
+        # |zw|^2 = |z|^2 |w|^2
+        zw_mod_squared = zw_re*zw_re + zw_im*zw_im
+
+        wrong_re = wrong_values(random, zw_re, 0.1)
+        wrong_im = numpy.column_stack([
+            near_value(random, zw_im, 0.1) for _ in xrange(2)
+        ])
+
+        self.columns.update(
+            zw_re=zw_re,
+            zw_im=zw_im,
+            zw_mod_squared=zw_mod_squared,
+            wrong_re=wrong_re,
+            wrong_im=wrong_im,
+            wrong_zw_mod=wrong_values(random, zw_mod_squared, 0.1),
+            wrong_z_mod_w_mod=wrong_values(
+                random, zw_mod_squared, 0.1
+            )
+        )
+
+    def parts(self, row):
+        question_type = self.question_type
+        zw_mod = row['zw_mod_squared']
+        return [
+            (question_type.zw_var, [
+                complex_number(row['zw_re'], row['zw_im'])
+            ] + [
+                complex_number(re, im)
+                for re, im in zip(row['wrong_re'], row['wrong_im'])
+            ]),
+            (question_type.zw_mod_var, [
+                self.square_root(value)
+                for value in [zw_mod] + list(row['wrong_zw_mod'])
+            ]),
+            (question_type.z_mod_w_mod_var, [
+                self.square_root(value)
+                for value in [zw_mod] + list(row['wrong_z_mod_w_mod'])
+            ])
+        ]
+
+
+class DivisionBatch(QuestionBatch):
+    """
+    A batch of `ModulusDivisionQuestion`s.
+    """
+    def generate(self, random, a, b, c, d):
+        # z / w = [(ac + bd) + (cb - ad)j] / (c*c + d*d), with the
+        # same (floor) division as `compute_divide`.
+        divisor = c*c + d*d
+        z_div_w_re = (a*c + b*d) // divisor
+        z_div_w_im = (c*b - a*d) // divisor
+        z_div_w_mod_squared = (
+            z_div_w_re*z_div_w_re + z_div_w_im*z_div_w_im
+        )
+
+        wrong_re = wrong_values(random, z_div_w_re)
+        wrong_im = numpy.column_stack([
+            near_value(random, z_div_w_im) for _ in xrange(2)
+        ])
+
+        self.columns.update(
+            z_div_w_re=z_div_w_re,
+            z_div_w_im=z_div_w_im,
+            z_div_w_mod_squared=z_div_w_mod_squared,
+            wrong_re=wrong_re,
+            wrong_im=wrong_im,
+            wrong_z_div_w_mod=wrong_values(random, z_div_w_mod_squared),
+            wrong_z_mod_div_w_mod=wrong_values(
+                random, z_div_w_mod_squared
+            )
+        )
+
+    def parts(self, row):
+        question_type = self.question_type
+        mod = row['z_div_w_mod_squared']
+        return [
+            (question_type.z_div_w_var, [
+                complex_number(row['z_div_w_re'], row['z_div_w_im'])
+            ] + [
+                complex_number(re, im)
+                for re, im in zip(row['wrong_re'], row['wrong_im'])
+            ]),
+            (question_type.z_div_w_mod_var, [
+                self.square_root(value)
+                for value in [mod] + list(row['wrong_z_div_w_mod'])
+            ]),
+            (question_type.z_mod_div_w_mod_var, [
+                self.square_root(value)
+                for value in [mod] + list(row['wrong_z_mod_div_w_mod'])
+            ])
+        ]
+
+
+def complex_number(re, im):
+    """
+    :returns: A `MathsComplexNumber` of NumPy's `re` and `im`
+              rendered.
+    """
+    return MathsComplexNumber(
+        MathsConstant(int(re)), MathsConstant(int(im))
+    ).render()
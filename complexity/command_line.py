@@ -8,7 +8,12 @@
 
 """
 
-from complexity import create_app
+import argparse
+from functools import partial
+
+import complexity
+from complexity import create_app, build_assets as build_bundles
+from complexity.quizzes import sweep_instances
 
 def run(debug=False):
     """
@@ -25,6 +30,90 @@ def debug():
     """
     run(True)
 
+def serve(args=None):
+    """
+    Serve the application with worker processes, for production. The
+    options default to the `SERVE_*` config values.
+
+    Gunicorn is needed for the worker processes (see `serve.py`).
+
+    :param args: Command line arguments, defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve Complexity with worker processes."
+    )
+    parser.add_argument('--host', default=complexity.SERVE_HOST)
+    parser.add_argument('--port', type=int,
+                        default=complexity.SERVE_PORT)
+    parser.add_argument('--workers', type=int,
+                        default=complexity.SERVE_WORKERS,
+                        help="Number of worker processes.")
+    parser.add_argument('--threads', type=int,
+                        default=complexity.SERVE_THREADS,
+                        help="Number of threads in each worker.")
+    parser.add_argument('--no-preload', dest='preload',
+                        action='store_false',
+                        default=complexity.SERVE_PRELOAD,
+                        help="Create the application in each worker.")
+    parser.add_argument('--graceful-timeout', type=int,
+                        default=complexity.SERVE_GRACEFUL_TIMEOUT,
+                        help="Seconds workers get to finish requests.")
+    parser.add_argument('--async', dest='async_', action='store_true',
+                        default=complexity.SERVE_ASYNC,
+                        help="Handle requests with green threads.")
+    parser.add_argument('--connections', type=int,
+                        default=complexity.SERVE_CONNECTIONS,
+                        help="Requests each async worker handles at "
+                             "once.")
+    options = parser.parse_args(args)
+
+    # Gunicorn is only imported when serving.
+    from complexity.serve import serve as serve_app
+
+    factory = create_app
+    if options.async_ and complexity.STORAGE_LOCK_POLL is None:
+        # Waiting for the storage must let other requests run.
+        factory = partial(create_app,
+                          STORAGE_LOCK_POLL=complexity.ASYNC_LOCK_POLL)
+
+    serve_app(factory, options.host, options.port, options.workers,
+              options.threads, options.preload, options.graceful_timeout,
+              options.async_, options.connections)
+
+def build_assets():
+    """
+    Build every asset bundle ahead of time, so the application can be
+    run with `ASSETS_AUTO_BUILD = False` and never compiles them
+    itself.
+
+    Nothing is returned, as console scripts exit with what their entry
+    point returns.
+    """
+    # The bundles can't be built if they have to be prebuilt.
+    app = create_app(ASSETS_AUTO_BUILD=True)
+
+    with app.app_context():
+        built = build_bundles(app.jinja_env.assets_environment)
+
+    for filename in built:
+        print "Built {}".format(filename)
+
+def sweep():
+    """
+    Create an application instance and remove expired quiz instances
+    from its storage.
+
+    Nothing is returned, as console scripts exit with what their entry
+    point returns.
+    """
+    app = create_app()
+
+    checked, removed = sweep_instances(app.extensions['storage'])
+
+    print "Checked {} quiz instance(s), removed {} expired.".format(
+        checked, removed
+    )
+
 # If this is run directly and not via an import.
 if __name__ == '__main__':
     run()
@@ -8,7 +8,10 @@
 
 """
 
+import base64
 import hmac
+import json
+import zlib
 
 try:
     from secrets import COOKIE_SECRET as SECRET
@@ -86,3 +89,30 @@ class Cookie(object):
         return self.value != other.value or self.hash != other.hash
 
 
+def encode_state(state):
+    """
+    Encode a quiz state as a compressed string that can be stored in
+    a `Cookie`.
+
+    :param state: A `dict` of simple types (e.g. from
+                  `BaseQuiz.to_state`).
+
+    :returns: The encoded state.
+    """
+    data = json.dumps(state, separators=(',', ':'))
+    return base64.urlsafe_b64encode(zlib.compress(data, 9))
+
+def decode_state(data):
+    """
+    Decode a state from `encode_state`.
+
+    :param data: The encoded state.
+
+    :returns: The state, or None if `data` can not be decoded.
+    """
+    try:
+        return json.loads(zlib.decompress(
+            base64.urlsafe_b64decode(str(data))
+        ))
+    except (TypeError, ValueError, zlib.error):
+        return None
@@ -0,0 +1,344 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: leaderboard.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Storage of quiz records.
+
+"""
+
+import time
+
+from flask import current_app, has_app_context
+
+# Number of records kept in order for each quiz.
+RECORDS_LIMIT = 100
+
+# Scores the rank index can tell apart, higher scores are counted as
+# `SCORE_LIMIT - 1`. A power of 2 keeps the index balanced.
+SCORE_LIMIT = 2 ** 12
+
+
+def insort_descending(items, item):
+    """
+    Insert `item` into `items` keeping it in descending order. The
+    same as `bisect.insort` but for a list in reverse.
+
+    :param items: List in descending order.
+    :param item: The item to insert.
+
+    :returns: The index `item` was inserted at.
+    """
+    low, high = 0, len(items)
+
+    while low < high:
+        middle = (low + high) // 2
+        if items[middle] < item:
+            high = middle
+        else:
+            low = middle + 1
+
+    items.insert(low, item)
+    return low
+
+
+class ScoreIndex(object):
+    """
+    The number of records with each score, kept as a Fenwick (binary
+    indexed) tree so both counting a score and finding how many
+    records have a lower score only use O(log `size`) keys.
+
+    Each node is kept under its own key so only the nodes that change
+    are written.
+
+    :param shelve: The open shelve (file) from flask-shelve.
+    :param key: The key the nodes are kept under.
+    :param size: The number of scores that can be told apart.
+    """
+    def __init__(self, shelve, key, size=SCORE_LIMIT):
+        self.shelve = shelve
+        self.key = key
+        self.size = size
+
+    def node_key(self, index):
+        return '{}-{}'.format(self.key, index)
+
+    def _node(self, score):
+        # Nodes start at 1.
+        return min(max(int(score), 0), self.size - 1) + 1
+
+    def add(self, score):
+        """
+        Count a record with `score`.
+
+        :param score: The record's score.
+        """
+        index = self._node(score)
+
+        while index <= self.size:
+            key = self.node_key(index)
+            self.shelve[key] = self.shelve.get(key, 0) + 1
+            index += index & -index
+
+    def count_upto(self, score):
+        """
+        :param score: The highest score to count.
+
+        :returns: The number of records with a score of at most
+                  `score`.
+        """
+        if score < 0:
+            return 0
+
+        index = self._node(score)
+        count = 0
+
+        while index > 0:
+            count += self.shelve.get(self.node_key(index), 0)
+            index -= index & -index
+
+        return count
+
+
+def pages_cache():
+    """
+    The application's rendered pages of records, kept until the
+    records change (see `Leaderboard.invalidate_cache`).
+
+    :returns: A `dict` of `tuple`s of when the records were updated
+              and the page's HTML, by quiz module and page number.
+    """
+    return current_app.extensions.setdefault('records_cache', {})
+
+
+class Leaderboard(object):
+    """
+    The records for a quiz.
+
+    Only the best `limit` records are kept in order, under the quiz's
+    module name (the key all records used to be kept under). Every
+    record is also appended to an archive, one key for each, so
+    adding a record only ever writes a few small values no matter
+    how many records there are. Every score is also counted in a
+    `ScoreIndex` so any score can be ranked against all the records.
+
+    Records are `tuple`s of a score and name.
+
+    :param shelve: The open shelve (file) from flask-shelve.
+    :param quiz_module: The name of the quiz's module.
+    :param limit: Number of records to keep in order.
+    """
+    def __init__(self, shelve, quiz_module, limit=RECORDS_LIMIT):
+        self.shelve = shelve
+        self.key = str(quiz_module)
+        self.limit = limit
+
+    @property
+    def count_key(self):
+        return self.key + '-count'
+
+    @property
+    def updated_key(self):
+        return self.key + '-updated'
+
+    @property
+    def ranked_key(self):
+        return self.key + '-ranked'
+
+    @property
+    def scores(self):
+        return ScoreIndex(self.shelve, self.key + '-rank')
+
+    def archive_key(self, index):
+        return '{}-{}'.format(self.key, index)
+
+    def top(self):
+        """
+        :returns: The best records in order, best first.
+        """
+        return self.shelve.get(self.key, [])
+
+    @property
+    def updated(self):
+        """
+        :returns: The time `top` last changed, or None if it never
+                  has.
+        """
+        return self.shelve.get(self.updated_key)
+
+    def snapshot(self):
+        """
+        Read `top` and when it was `updated` together, so they always
+        agree even while records are being added.
+
+        :returns: A `tuple` of `top` and `updated`.
+        """
+        top, updated = self.shelve.get_many([self.key, self.updated_key])
+        return (top or []), updated
+
+    def page(self, number, size, top=None):
+        """
+        :param number: The page's number, starting at 1.
+        :param size: The number of records on each page.
+        :param top: The best records already read (e.g. from
+                    `snapshot`), instead of reading them again.
+
+        :returns: The records on the page of `top`.
+        """
+        if top is None:
+            top = self.top()
+
+        start = (number - 1) * size
+        return top[start:start + size]
+
+    def __len__(self):
+        """
+        :returns: The number of records ever added.
+        """
+        count = self.shelve.get(self.count_key)
+        if count is None:
+            # Nothing has been archived yet.
+            return len(self.top())
+        return count
+
+    def archived(self, index):
+        """
+        :param index: The record's index, in the order added.
+
+        :returns: The archived record.
+        """
+        return self.shelve[self.archive_key(index)]
+
+    def unindexed(self):
+        """
+        :returns: True if some records aren't counted in the
+                  `ScoreIndex` yet (e.g. records from before there was
+                  one), so `index` needs to be used.
+        """
+        count = self.shelve.get(self.count_key)
+        if count is None:
+            return len(self.top()) > 0
+        return self.shelve.get(self.ranked_key, 0) < count
+
+    def index(self):
+        """
+        Archive and count every record not yet in the `ScoreIndex`.
+        The storage must be open for writing.
+        """
+        with self.shelve.locked(self.key):
+            self._index_archive(self._archive_top())
+
+    def rank(self, score):
+        """
+        Rank a score against every record.
+
+        Any records not yet counted (see `unindexed`) are counted
+        first, which needs the storage open for writing.
+
+        :param score: The score to rank.
+
+        :returns: A `dict` of the score's 'rank' (starting at 1), the
+                  'percentile' (the percentage of records with a lower
+                  score) and the 'total' number of records ranked.
+        """
+        if self.unindexed():
+            self.index()
+
+        scores = self.scores
+        total = self.shelve.get(self.ranked_key, 0)
+        lower = scores.count_upto(score - 1)
+        higher = total - scores.count_upto(score)
+
+        return dict(
+            rank=higher + 1,
+            percentile=100.0 * lower / total if total else 100.0,
+            total=total
+        )
+
+    def _archive_top(self):
+        """
+        Archive the records from before there was an archive, which
+        are all kept under `self.key`.
+
+        :returns: The number of archived records.
+        """
+        count = self.shelve.get(self.count_key)
+        if count is not None:
+            return count
+
+        top = self.top()
+        for index, record in enumerate(top):
+            self.shelve[self.archive_key(index)] = record
+
+        count = len(top)
+        self.shelve[self.count_key] = count
+        self._save_top(top)
+        return count
+
+    def _index_archive(self, count):
+        """
+        Count every archived record not yet in the `ScoreIndex`
+        (e.g. records from before there was one).
+
+        :param count: The number of archived records.
+        """
+        scores = self.scores
+        ranked = self.shelve.get(self.ranked_key, 0)
+
+        for index in xrange(ranked, count):
+            scores.add(self.archived(index)[0])
+
+        if ranked != count:
+            self.shelve[self.ranked_key] = count
+
+    def add(self, record):
+        """
+        Add a record.
+
+        :param record: A `tuple` of a score and name.
+
+        :returns: The record's position in `top` (starting at 0) or
+                  None if it's not in the best `limit` records.
+        """
+        with self.shelve.locked(self.key):
+            count = self._archive_top()
+            top = self.top()
+
+            self.shelve[self.archive_key(count)] = record
+            self.shelve[self.count_key] = count + 1
+            self._index_archive(count + 1)
+
+            # Only update the best records when it is one of them.
+            if len(top) >= self.limit and top[self.limit - 1] >= record:
+                return None
+
+            position = insort_descending(top, record)
+            self._save_top(top)
+
+            return position
+
+    def _save_top(self, top):
+        """
+        Save the best records now they've changed.
+
+        :param top: The best records in order, maybe more than
+                    `limit`.
+        """
+        del top[self.limit:]
+        self.shelve[self.key] = top
+        self.shelve[self.updated_key] = time.time()
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Remove the cached pages of the records (see `pages_cache`),
+        if there is an application caching them.
+        """
+        if not has_app_context():
+            return
+
+        cache = pages_cache()
+        for key in cache.keys():
+            if key[0] == self.key:
+                del cache[key]
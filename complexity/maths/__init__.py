@@ -12,14 +12,14 @@
 IMAGINARY_NOTATION = 'j'
 DEFAULT_FORMAT = 'LaTeX'
 
-make_brackets = lambda s: '({})'.format(s)
-
+from .formats import FORMATS, make_brackets, make_math
 from .operators import MathsOperator
 from .expression import MathsExpression
 from .operands import (MathsOperand, MathsConstant,
                        MathsRandomConstant, MathsVariable, BODMAS)
 from . import operators
 from .complex import MathsImaginaryNumber, MathsComplexNumber
+from .shared import shared_variable, shared_constant, shared_expression
 
 # __all__ is what gets imported when selecting '*' with:
 #     from __name__ import *
@@ -27,4 +27,5 @@ from .complex import MathsImaginaryNumber, MathsComplexNumber
 __all__ = ['MathsOperand', 'MathsOperator', 'MathsExpression',
            'MathsConstant', 'MathsRandomConstant', 'MathsVariable',
            'operators', 'MathsImaginaryNumber', 'MathsComplexNumber',
-           'BODMAS']
+           'BODMAS', 'FORMATS', 'make_math', 'shared_variable',
+           'shared_constant', 'shared_expression']
@@ -10,8 +10,12 @@
 """
 
 from .expression import MathsExpression
-from .operands import MathsConstant, MathsVariable
-from . import IMAGINARY_NOTATION, operators
+from .operands import MathsConstant, MathsRandomConstant
+from .shared import shared_constant, shared_expression, shared_variable
+from . import IMAGINARY_NOTATION, DEFAULT_FORMAT, operators
+
+# The same 'j' is used by every imaginary number.
+imaginary_unit = shared_variable(IMAGINARY_NOTATION)
 
 
 class MathsImaginaryNumber(MathsExpression):
@@ -27,10 +31,12 @@ class MathsImaginaryNumber(MathsExpression):
     :param im: A `MathsOperator` (or child class) object for the
                imaginary part.
     """
+    __slots__ = ()
+
     def __init__(self, im):
         super(MathsImaginaryNumber, self).__init__([
             im,
-            MathsVariable(IMAGINARY_NOTATION)
+            imaginary_unit
         ])
 
 
@@ -50,11 +56,24 @@ class MathsComplexNumber(MathsExpression):
     :param im: A `MathsOperator` (or child class) object for the
                imaginary part.
 
-    :param kwargs: Options for rendering.
+    :param kwargs: Options for evaluating.
+
+    When both parts are constants, it's rendered from `plan` with a
+    single format.
     """
+    # `RenderPlan`s for complex numbers with constant parts, by
+    # format.
+    _plans = {}
+
+    __slots__ = ('re', 'im', 'constant')
+
     def __init__(self, re, im, **kwargs):
-        self.re = re.render(**kwargs)
-        self.im = im.render(**kwargs)
+        self.re = re.evaluate(**kwargs)
+        self.im = im.evaluate(**kwargs)
+        # Not random constants, whose value changes when they're
+        # reset.
+        self.constant = type(re) is MathsConstant and\
+            type(im) is MathsConstant
         super(MathsComplexNumber, self).__init__(
             [
                 re,
@@ -63,6 +82,30 @@ class MathsComplexNumber(MathsExpression):
             operators.add
         )
 
+    @classmethod
+    def plan(cls, format_=DEFAULT_FORMAT):
+        """
+        :param format_: The format to render.
+        :return: The `RenderPlan` for complex numbers with constant
+                 parts, with slots for the real and imaginary parts.
+        """
+        plan = cls._plans.get(format_)
+        if plan is None:
+            plan = cls._plans[format_] = MathsExpression([
+                MathsRandomConstant(0, 1),
+                MathsImaginaryNumber(MathsRandomConstant(0, 1))
+            ], operators.add).compile(format_=format_)
+        return plan
+
+    def render(self, **kwargs):
+        # Constant parts don't use `random`, any other option might
+        # change how it's rendered.
+        if self.constant and set(kwargs) <= {'random', 'format_'}:
+            return self.plan(
+                kwargs.get('format_', DEFAULT_FORMAT)
+            ).format(self.re, self.im)
+        return super(MathsComplexNumber, self).render(**kwargs)
+
 
 def compute_modulus(z):
     """
@@ -75,8 +118,8 @@ def compute_modulus(z):
     a, b = z.re, z.im
 
     # |z| = sqrt(a*a + b*b)
-    return MathsExpression(
-        MathsConstant(a*a + b*b),
+    return shared_expression(
+        shared_constant(a*a + b*b),
         operators.sqrt,
     )
 
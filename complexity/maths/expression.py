@@ -10,8 +10,8 @@
 
 import collections
 
-from . import DEFAULT_FORMAT, operators
-from .operands import MathsOperand
+from . import operators
+from .operands import MathsOperand, MathsRandomConstant
 
 
 class MathsExpression(MathsOperand):
@@ -27,8 +27,17 @@ class MathsExpression(MathsOperand):
                      (or child class of MathOperand) object(s).
 
     :param operator: A Maths Operator Object.
+
+    Renders are cached, by format and options, until any
+    `MathsRandomConstant` is reset. The operands MUST NOT be changed
+    once rendered.
     """
 
+    __slots__ = ('operands', 'operator', '_renders')
+
+    # Renders are cached again once it's unpickled.
+    _unpickled = ('__weakref__', '_renders')
+
     def __init__(self, operands, operator=operators.multiply):
         # If its a single instance turn it into a list.
         if isinstance(operands, MathsOperand):
@@ -47,23 +56,68 @@ class MathsExpression(MathsOperand):
 
         self.operands = operands
         self.operator = operator
+        self._renders = {}
 
         super(MathsExpression, self).__init__(
             order=operator.order
         )
 
+    def __setstate__(self, state):
+        super(MathsExpression, self).__setstate__(state)
+        self._renders = {}
+
     def render(self, **kwargs):
         """
-        Render the MathExpression object into the `DEFAULT_FORMAT`.
+        Render the MathExpression object into the `format_` option,
+        or the `DEFAULT_FORMAT`.
 
         :param kwargs: Any options to be passed for other,
                         MathsOperands. (e.g. seeds for
                         MathsRandomConstant)
-        :return: `DEFAULT_FORMAT` representation of the expression.
+        :return: The expression in the chosen format.
+        """
+        # `random` is only used by operands not yet rendered, so
+        # doesn't change what is rendered.
+        options = [
+            item for item in kwargs.iteritems() if item[0] != 'random'
+        ]
+        key = tuple(sorted(options)) if options else None
+        generation, rendered = self._renders.get(key, (None, None))
+
+        if generation != MathsRandomConstant.generation:
+            # Recursion can occur here as the `render` method is
+            # called for each operand which may contain another
+            # `MathsExpression`.
+            rendered = self.operator(
+                *self.operands, **kwargs
+            ).render(**kwargs)
+            self._renders[key] = (
+                MathsRandomConstant.generation, rendered
+            )
+
+        return rendered
+
+    def compile(self, **kwargs):
+        """
+        Compile the expression into a `RenderPlan`, to render
+        expressions of the same structure with a single format.
+
+        :param kwargs: Render options (e.g. `format_`).
+        :return: The `RenderPlan`, with a slot for each
+                 `MathsRandomConstant`.
+        """
+        # Imported here as `plan` depends on this module.
+        from .plan import RenderPlan
+        return RenderPlan(self, **kwargs)
+
+    def evaluate(self, **kwargs):
+        """
+        Compute the expression's numeric value, without rendering.
+
+        :param kwargs: Evaluate options, passed to every operand.
+        :return: The value, as an `int`, `Fraction`, `float` or
+                 `complex`.
         """
-        # Recursion can occur here as the `render` method is called
-        # for each operand which may contain another
-        # `MathsExpression`.
-        return self.operator[DEFAULT_FORMAT](
-            *self.operands, **kwargs
-        ).render(**kwargs)
+        return self.operator.evaluate(*[
+            operand.evaluate(**kwargs) for operand in self.operands
+        ])
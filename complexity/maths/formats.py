@@ -0,0 +1,94 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: maths/formats.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    The formats expressions can be rendered into.
+
+"""
+
+from . import DEFAULT_FORMAT
+
+# The symbols used by each format, as format strings. A `fraction`
+# of None means fractions are just divided with the `divide`
+# delimiter.
+FORMATS = {
+    'LaTeX': dict(
+        row='{}',
+        brackets='({})',
+        times=r' \times ',
+        divide=r' \div ',
+        fraction='\\frac{{ {} }}{{ {} }}',
+        add=' + ',
+        subtract=' - ',
+        abs='\\left|{} \\right|',
+        sqrt='\\sqrt{{ {} }}',
+        constant='{}',
+        variable='{}',
+        equals='{} = {}'
+    ),
+    # Presentation MathML, without the `math` element so it can be
+    # used inside other MathML.
+    'MathML': dict(
+        row='<mrow>{}</mrow>',
+        brackets='<mrow><mo>(</mo>{}<mo>)</mo></mrow>',
+        times='<mo>×</mo>',
+        divide='<mo>÷</mo>',
+        fraction='<mfrac><mrow>{}</mrow><mrow>{}</mrow></mfrac>',
+        add='<mo>+</mo>',
+        subtract='<mo>-</mo>',
+        abs='<mrow><mo>|</mo>{}<mo>|</mo></mrow>',
+        sqrt='<msqrt>{}</msqrt>',
+        constant='<mn>{}</mn>',
+        variable='<mi>{}</mi>',
+        equals='<mrow>{}<mo>=</mo>{}</mrow>'
+    ),
+    # Plain text, for clients that can't typeset maths at all.
+    'text': dict(
+        row='{}',
+        brackets='({})',
+        times=' × ',
+        divide=' / ',
+        fraction=None,
+        add=' + ',
+        subtract=' - ',
+        abs='|{}|',
+        sqrt='√({})',
+        constant='{}',
+        variable='{}',
+        equals='{} = {}'
+    )
+}
+
+
+def symbols(format_=DEFAULT_FORMAT):
+    """
+    :param format_: The format's name.
+
+    :returns: The `dict` of symbols used by `format_`.
+
+    :raises ValueError: When there is no format called `format_`.
+    """
+    try:
+        return FORMATS[format_]
+    except KeyError:
+        raise ValueError("Unknown format '{}'.".format(format_))
+
+def make_brackets(rendered, format_=DEFAULT_FORMAT):
+    """
+    :param rendered: A rendered expression.
+    :param format_: The format it was rendered in.
+
+    :returns: `rendered` in brackets.
+    """
+    return symbols(format_)['brackets'].format(rendered)
+
+def make_math(rendered):
+    """
+    :param rendered: A rendered expression in the 'MathML' format.
+
+    :returns: `rendered` as a `math` element, ready to use in HTML.
+    """
+    return '<math>{}</math>'.format(rendered)
+
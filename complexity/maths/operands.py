@@ -11,7 +11,8 @@
 
 from random import Random
 
-from . import make_brackets
+from . import DEFAULT_FORMAT, IMAGINARY_NOTATION
+from .formats import symbols, make_brackets
 
 
 class BODMAS(object):
@@ -24,18 +25,54 @@ class BODMAS(object):
     ) = range(6)
 
 
+def slot_names(cls):
+    """
+    :param cls: A class using `__slots__`.
+
+    :returns: The names of the slots of `cls` and all its bases.
+    """
+    return [
+        name
+        for base in reversed(cls.__mro__)
+        for name in base.__dict__.get('__slots__', ())
+    ]
+
+
 class MathsOperand(object):
     """
     Represents operands in MathExpressions.
 
+    Operands (and all child classes) use `__slots__`, as questions
+    create many of them. They're pickled as just a `tuple` of the
+    slots, without any in `_unpickled`.
+
     :param value: The value of the operand.
     :param order: The order of operations for the operand.
     """
+    __slots__ = ('_value', '_order', '__weakref__')
+
+    # Slots that are not pickled.
+    _unpickled = ('__weakref__',)
 
     def __init__(self, value=None, order=None):
         self._value = value
         self._order = order
 
+    def __getstate__(self):
+        return tuple(
+            getattr(self, name, None)
+            for name in slot_names(type(self))
+            if name not in self._unpickled
+        )
+
+    def __setstate__(self, state):
+        names = [
+            name for name in slot_names(type(self))
+            if name not in self._unpickled
+        ]
+        for name, value in zip(names, state):
+            setattr(self, name, value)
+
     @property
     def enclosed(self):
         """
@@ -76,6 +113,35 @@ class MathsOperand(object):
         """
         return self._value
 
+    def render_symbol(self, symbol, **kwargs):
+        """
+        Render `value` as `symbol` in the chosen format (e.g. as a
+        'constant' or 'variable').
+
+        :param symbol: The name of the symbol.
+        :param kwargs: Render options, with `format_`.
+        :returns: `value` as it is if the symbol doesn't change it,
+                  otherwise the formatted `value`.
+        """
+        value = self.evaluate(**kwargs)
+        template = symbols(
+            kwargs.get('format_', DEFAULT_FORMAT)
+        )[symbol]
+
+        if template == '{}':
+            return value
+        return template.format(value)
+
+    def evaluate(self, **kwargs):
+        """
+        Compute the operand's numeric value, without rendering.
+
+        :param kwargs: Evaluate options (e.g. `variables`, a `dict`
+                       of values for `MathsVariable`s by name).
+        :returns: `value`
+        """
+        return self._value
+
     def render_auto_brackets(self, order, **kwargs):
         """
         Combines `render` and `requires_brackets for convenience
@@ -86,7 +152,9 @@ class MathsOperand(object):
 
         # Add brackets if needed.
         if self.requires_brackets(order):
-            rendered = make_brackets(rendered)
+            rendered = make_brackets(
+                rendered, kwargs.get('format_', DEFAULT_FORMAT)
+            )
 
         return str(rendered)
 
@@ -95,17 +163,30 @@ class MathsConstant(MathsOperand):
     """
     Represents constants.
     """
+    __slots__ = ()
+
     def __init__(self, value):
         super(MathsConstant, self).__init__(
             value=value,
             order=None
         )
 
+    def render(self, **kwargs):
+        return self.render_symbol('constant', **kwargs)
+
 
 class MathsRandomConstant(MathsConstant):
     """
     Represents constants that are required to be random.
+
+    :cvar generation: Increased whenever any instance is reset, so
+                      renders that might have used the old value are
+                      no longer used.
     """
+    generation = 0
+
+    __slots__ = ('_start', '_end', '_step', '_render')
+
     def __init__(self, start, end, step=1):
         self._start = start
         self._end = end
@@ -118,8 +199,15 @@ class MathsRandomConstant(MathsConstant):
 
     def reset(self):
         self._render = None
+        MathsRandomConstant.generation += 1
 
-    def render(self, **kwargs):
+    def evaluate(self, **kwargs):
+        """
+        The value is chosen when first used, then kept until `reset`.
+
+        :param kwargs: Options, with `random` to choose the value.
+        :returns: The value.
+        """
         if hasattr(self, '_render') and self._render is not None:
             return self._render
 
@@ -138,8 +226,34 @@ class MathsVariable(MathsOperand):
     """
     Represents varibles.
     """
+    __slots__ = ()
+
     def __init__(self, value):
         super(MathsVariable, self).__init__(
             value,
             order=BODMAS.brackets
         )
+
+    def render(self, **kwargs):
+        format_ = kwargs.get('format_', DEFAULT_FORMAT)
+        return symbols(format_)['variable'].format(self._value)
+
+    def evaluate(self, **kwargs):
+        """
+        :param kwargs: Evaluate options, with `variables`.
+        :returns: The variable's value from `variables`. The
+                  `IMAGINARY_NOTATION` is always the imaginary unit.
+
+        :raises ValueError: When the variable has no value.
+        """
+        variables = kwargs.get('variables', {})
+
+        if self._value in variables:
+            return variables[self._value]
+
+        if self._value == IMAGINARY_NOTATION:
+            return 1j
+
+        raise ValueError(
+            "No value for variable '{}'.".format(self._value)
+        )
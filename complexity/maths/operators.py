@@ -8,7 +8,14 @@
 
 """
 
-from . import DEFAULT_FORMAT, make_brackets
+import __builtin__
+import cmath
+import pickle
+from fractions import Fraction
+from numbers import Rational
+
+from . import DEFAULT_FORMAT
+from .formats import FORMATS, symbols, make_brackets
 from .operands import MathsOperand, BODMAS
 
 
@@ -23,25 +30,25 @@ class MathsOperator(object):
     @classmethod
     def new(cls, order):
         """
-        Creates a decorator to be used on functions for operands with
-        only the `DEFAULT_FORMAT`.
+        Creates a decorator to be used on functions for operands
+        that render every format in `FORMATS`, using the symbols of
+        the `format_` option.
 
         :param order: The order (BODMAS value).
         :return: The decorator.
         """
         def dec(func):
             """
-            Created MathsOperator instance with only
-            `DEFAULT_FORMAT`.
+            Created MathsOperator instance with every format.
 
-            :param func: The function for `DEFAULT_FORMAT`.
+            :param func: The function for every format.
             :return: MathsOperator instance.
             """
-            return cls(order, **{DEFAULT_FORMAT: func})
+            return cls(order, **{format_: func for format_ in FORMATS})
         return dec
 
     @classmethod
-    def auto_new(cls, order, delimiter):
+    def auto_new(cls, order, symbol):
         """
         Automatically creates function for operators which simply has
         a delimiter (e.g. + and -). Not for operators with additional
@@ -49,37 +56,76 @@ class MathsOperator(object):
         etc.
 
         :param order: The order (BODMAS value).
-        :param delimiter: The delimiter (e.g. ' + ', or ' - ').
+        :param symbol: The name of the delimiter's symbol in
+                       `FORMATS` (e.g. 'add').
         :return: Instance of MathsOperator.
         """
         @cls.new(order)
         def func(*operands, **kwargs):
+            format_ = symbols(kwargs.get('format_', DEFAULT_FORMAT))
             return MathsOperand(
-                delimiter.join([
+                format_['row'].format(format_[symbol].join([
                     operand.render_auto_brackets(order, **kwargs)
                     for operand in operands
-                ]),
-                order,
-                **kwargs
+                ])),
+                order
             )
         return func
 
     def __init__(self, order, **formats):
         self.order = order
         self._formats = formats
+        self._evaluate = None
+
+    def evaluates(self, func):
+        """
+        Decorator to set the function that computes the operator's
+        value, given its operands' values.
+
+        :param func: The function.
+        :return: `func`
+        """
+        self._evaluate = func
+        return func
+
+    def evaluate(self, *values):
+        """
+        :param values: The operands' values.
+        :return: The value of the operator applied to `values`.
+
+        :raises NotImplementedError: When the operator can't be
+                                     evaluated.
+        """
+        if self._evaluate is None:
+            raise NotImplementedError
+        return self._evaluate(*values)
 
     def __call__(self, *operands, **kwargs):
         """
-        When called as a function the `DEFAULT_FORMAT` is used.
+        When called as a function the `format_` option is used, or
+        the `DEFAULT_FORMAT`.
 
         :param operands: MathOperands to be operated on.
         :param kwargs: any options for rendering.
-        :return: A representation of the expression in the
-                  `DEFAULT_FORMAT`.
+        :return: A representation of the expression in the format.
         """
         format_ = kwargs.get('format_', DEFAULT_FORMAT)
 
-        return self.__getitem__(format_)(*operands)
+        return self.__getitem__(format_)(*operands, **kwargs)
+
+    def __reduce__(self):
+        """
+        Pickle operators by their name in this module, as they're
+        shared by every expression.
+
+        :return: The operator's name.
+        """
+        for name, value in globals().items():
+            if value is self:
+                return name
+        raise pickle.PicklingError(
+            "Only the operators in {} can be pickled.".format(__name__)
+        )
 
     def __getitem__(self, format_):
         """
@@ -90,19 +136,26 @@ class MathsOperator(object):
         :param format_: Chosen format.
         :return: Function for this operator that given the operands
                  renders the expression.
+
+        :raises ValueError: When the operator can't render
+                            `format_`.
         """
-        return self._formats[format_]
+        try:
+            return self._formats[format_]
+        except KeyError:
+            raise ValueError("Unknown format '{}'.".format(format_))
 
 
 @MathsOperator.new(BODMAS.multiplication)
 def multiply(*operands, **kwargs):
     """
-    Renders multiplication expressions into the `DEFAULT_FORMAT`.
+    Renders multiplication expressions.
 
     :param operands: The operands.
     :param kwargs: Render options.
     :return: Rendered expression in MathsOperand to keep order data.
     """
+    format_ = kwargs.get('format_', DEFAULT_FORMAT)
     explicit = []
     implicit = []
     for operand in operands:
@@ -122,14 +175,14 @@ def multiply(*operands, **kwargs):
                 # Only add brackets when we have to.
                 # Unfortunately we have to here.
                 implicit.append(
-                    make_brackets(operand.render(**kwargs))
+                    make_brackets(operand.render(**kwargs), format_)
                 )
         else:
             # Add it to `implicit` then.
             implicit.append(str(operand.render(**kwargs)))
 
     # Join explicit list into string delimited by multiplication.
-    explicit_out = r' \times '.join(explicit)
+    explicit_out = symbols(format_)['times'].join(explicit)
     # If it is implicit, no delimiters are needed.
     implicit_out = ''.join(implicit)
 
@@ -137,36 +190,38 @@ def multiply(*operands, **kwargs):
     # '(2 * 3 * 4)a' but not for '2 * 3 * 4') and only when there's
     # more than one explict value (e.g. for '(2*3)a' but not '2a').
     if len(implicit) and len(explicit) > 1:
-        explicit_out = make_brackets(explicit_out)
+        explicit_out = make_brackets(explicit_out, format_)
 
     return MathsOperand(
-        explicit_out + implicit_out,
+        symbols(format_)['row'].format(explicit_out + implicit_out),
         BODMAS.multiplication
     )
 
 @MathsOperator.new(BODMAS.division)
 def divide(*operands, **kwargs):
     """
-    Renders division expressions into the `DEFAULT_FORMAT`.
+    Renders division expressions.
 
     :param operands: The operands.
     :param kwargs: Render options.
     :return: Rendered expression in MathsOperand to keep order data.
     """
+    format_ = symbols(kwargs.get('format_', DEFAULT_FORMAT))
+
     # If there are only two operands, treat them as a fraction.
-    if len(operands) == 2:
-        value = '\\frac{{ {} }}{{ {} }}'.format(*[
+    if len(operands) == 2 and format_['fraction'] is not None:
+        value = format_['fraction'].format(*[
             str(operand.render(**kwargs))
             for operand in operands
         ])
     # Else just join them with a delimiter
     else:
-        value = r' \div '.join([
+        value = format_['row'].format(format_['divide'].join([
             operand.render_auto_brackets(
                 BODMAS.division, **kwargs
             )
             for operand in operands
-        ])
+        ]))
 
     return MathsOperand(
         value,
@@ -176,34 +231,69 @@ def divide(*operands, **kwargs):
 @MathsOperator.new(BODMAS.brackets)
 def abs(operand, **kwargs):
     """
-    Renders absolute value expressions into the `DEFAULT_FORMAT`.
+    Renders absolute value expressions.
 
     :param operand: The operand.
     :param kwargs: Render options.
     :return: Rendered expression in MathsOperand to keep order data.
     """
     # Simply add | either side and treat as brackets.
+    format_ = symbols(kwargs.get('format_', DEFAULT_FORMAT))
     return MathsOperand(
-        '\\left|{} \\right|'.format(operand.render(**kwargs)),
+        format_['abs'].format(operand.render(**kwargs)),
         BODMAS.brackets,
     )
 
 @MathsOperator.new(BODMAS.brackets)
 def sqrt(operand, **kwargs):
     """
-    Renders square root expressions into the `DEFAULT_FORMAT`.
+    Renders square root expressions.
 
     :param operand: The operand.
     :param kwargs: Render options.
     :return: Rendered expression in MathsOperand to keep order data.
     """
     # Simply add square root symbol and treat as brackets.
+    format_ = symbols(kwargs.get('format_', DEFAULT_FORMAT))
     return MathsOperand(
-        '\\sqrt{{ {} }}'.format(operand.render(**kwargs)),
+        format_['sqrt'].format(operand.render(**kwargs)),
         BODMAS.brackets,
     )
 
 # Simple operator definitions. They equate to the same as above but
 # can be generated automatically as there rules are simpler.
-add = MathsOperator.auto_new(BODMAS.addition, ' + ')
-subtract = MathsOperator.auto_new(BODMAS.subtraction, ' - ')
+add = MathsOperator.auto_new(BODMAS.addition, 'add')
+subtract = MathsOperator.auto_new(BODMAS.subtraction, 'subtract')
+
+# Functions to compute the value of each operator.
+
+@multiply.evaluates
+def _multiply(*values):
+    return reduce(lambda a, b: a * b, values)
+
+@divide.evaluates
+def _divide(*values):
+    def div(a, b):
+        # Keep dividing whole numbers exact.
+        if isinstance(a, Rational) and isinstance(b, Rational):
+            return Fraction(a) / b
+        return a / b
+    return reduce(div, values)
+
+@abs.evaluates
+def _abs(value):
+    return __builtin__.abs(value)
+
+@sqrt.evaluates
+def _sqrt(value):
+    if isinstance(value, complex) or value < 0:
+        return cmath.sqrt(value)
+    return value ** 0.5
+
+@add.evaluates
+def _add(*values):
+    return sum(values)
+
+@subtract.evaluates
+def _subtract(*values):
+    return values[0] - sum(values[1:])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: maths/plan.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compile expressions into a format string, so expressions with
+    the same structure can be rendered with a single format.
+
+"""
+
+from .expression import MathsExpression
+from .operands import MathsConstant, MathsRandomConstant
+
+# Marks where a slot goes while compiling. Chosen so it can't
+# appear in a rendered expression.
+SLOT_MARK = '\x00{}\x00'
+
+
+class RenderPlan(object):
+    """
+    A compiled expression. Each `MathsRandomConstant` in the
+    expression is a slot in `template`, everything else is already
+    rendered.
+
+    :ivar template: A format string with a numbered field for each
+                    slot.
+    :ivar slots: The expression's `MathsRandomConstant`s, in the
+                 order of their fields.
+
+    :param expression: The `MathsExpression` to compile.
+    :param kwargs: Render options (e.g. `format_`).
+    """
+    def __init__(self, expression, **kwargs):
+        self.slots = []
+        rendered = str(marked(expression, self.slots).render(**kwargs))
+
+        # Keep the braces that are already there (e.g. LaTeX's).
+        rendered = rendered.replace('{', '{{').replace('}', '}}')
+
+        for index in xrange(len(self.slots)):
+            mark = SLOT_MARK.format(index)
+            rendered = rendered.replace(mark, '{{{}}}'.format(index))
+
+        self.template = rendered
+
+    def format(self, *values):
+        """
+        Render the expression with `values` in its slots.
+
+        :param values: A value for each slot.
+        :return: The rendered expression.
+        """
+        return self.template.format(*values)
+
+    def render(self, **kwargs):
+        """
+        Render the expression with the slots' current values.
+
+        :param kwargs: Options for the slots (e.g. `random`).
+        :return: The rendered expression.
+        """
+        return self.format(*[
+            slot.evaluate(**kwargs) for slot in self.slots
+        ])
+
+
+def marked(operand, slots):
+    """
+    Copy an expression with each `MathsRandomConstant` replaced by a
+    constant that renders as its slot's mark.
+
+    :param operand: A `MathsOperand` (or child class) object.
+    :param slots: A `list` the `MathsRandomConstant`s are added to.
+
+    :returns: The copy.
+    """
+    if isinstance(operand, MathsRandomConstant):
+        slots.append(operand)
+        return MathsConstant(SLOT_MARK.format(len(slots) - 1))
+
+    if isinstance(operand, MathsExpression):
+        return MathsExpression(
+            [marked(child, slots) for child in operand.operands],
+            operand.operator
+        )
+
+    return operand
@@ -0,0 +1,92 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: maths/shared.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Create shared (hash-consed) operands, so identical operands are
+    only created once and their renders are cached for everything
+    that uses them.
+
+    Shared operands MUST NOT be changed.
+
+"""
+
+from weakref import WeakValueDictionary
+
+from . import operators
+from .expression import MathsExpression
+from .operands import MathsConstant, MathsVariable
+
+# Shared operands by their structure.
+_shared = WeakValueDictionary()
+# Shared operands by their `id`, to check operands are shared.
+_shared_ids = WeakValueDictionary()
+
+
+def _share(key, create):
+    """
+    :param key: The operand's structure.
+    :param create: Function to create the operand if there's no
+                   shared one.
+
+    :returns: The shared operand.
+    """
+    operand = _shared.get(key)
+
+    if operand is None:
+        operand = create()
+        # Another thread might have shared one first.
+        operand = _shared.setdefault(key, operand)
+        _shared_ids[id(operand)] = operand
+
+    return operand
+
+def is_shared(operand):
+    """
+    :param operand: A `MathsOperand` (or child class) object.
+
+    :returns: True if `operand` was created by this module.
+    """
+    return _shared_ids.get(id(operand)) is operand
+
+def shared_variable(name):
+    """
+    :param name: The variable's name.
+
+    :returns: A shared `MathsVariable`.
+    """
+    return _share(('variable', name), lambda: MathsVariable(name))
+
+def shared_constant(value):
+    """
+    :param value: The constant's value.
+
+    :returns: A shared `MathsConstant`.
+    """
+    return _share(
+        ('constant', type(value), value), lambda: MathsConstant(value)
+    )
+
+def shared_expression(operands, operator=operators.multiply):
+    """
+    :param operands: Either a list of, or a single, shared operand(s).
+    :param operator: A Maths Operator Object.
+
+    :returns: A shared `MathsExpression`.
+
+    :raises ValueError: When an operand isn't shared (e.g. a
+                        `MathsRandomConstant`, which can't be).
+    """
+    if not isinstance(operands, (list, tuple)):
+        operands = [operands]
+
+    if not all(is_shared(operand) for operand in operands):
+        raise ValueError("Only shared operands can be shared.")
+
+    # The operands are kept alive by the expression, so their `id`s
+    # can't be reused while it's shared.
+    return _share(
+        ('expression', operator, tuple(map(id, operands))),
+        lambda: MathsExpression(list(operands), operator)
+    )
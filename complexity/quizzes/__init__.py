@@ -9,11 +9,34 @@
 """
 
 import os
+import copy
+import time
 import uuid
+import threading
+from collections import deque, OrderedDict
 from pkgutil import iter_modules
 
 SHELVE_INSTANCE_PREFIX = 'quiz-'
 
+# Prefix of the keys that record which instances (stored in the
+# cookie) have finished.
+SHELVE_FINISHED_PREFIX = 'finished-'
+
+# Seconds the record of a finished instance is kept when the instance
+# itself never expires (no `QUIZ_INSTANCE_TTL`).
+FINISHED_TTL = 24 * 60 * 60
+
+# Version of the state created by `BaseQuiz.to_state`. Increase it
+# whenever the format of the state changes.
+STATE_VERSION = 6
+
+# Number of ready to ask questions kept for each question type.
+QUESTION_POOL_SIZE = 16
+
+# Number of recently asked questions kept, so they can be used
+# again without recreating them from their seed.
+QUESTION_CACHE_SIZE = 256
+
 # Get the quizzes package's path.
 quizzes_path = os.path.dirname(__file__)
 
@@ -37,6 +60,234 @@ quizzes = {
 # For reverse lookup.
 quizzes_rev = {v: k for k, v in quizzes.items()}
 
+def state_expired(state, now=None):
+    """
+    Check if a stored state can no longer be used.
+
+    :param state: The stored state (from `BaseQuiz.dump_state`).
+    :param now: The current time, defaults to `time.time()`.
+
+    :returns: True if `state` has expired or is not a valid state
+              (e.g. from an older `STATE_VERSION`).
+    """
+    if not isinstance(state, dict) or\
+       state.get('version') != STATE_VERSION:
+        return True
+
+    expires = state.get('expires')
+    if expires is None:
+        return False
+
+    return expires <= (time.time() if now is None else now)
+
+def sweep_instances(storage, now=None):
+    """
+    Remove all expired (or no longer valid) instances, and the
+    records of which instances finished once they've expired too.
+
+    :param storage: The storage backend (not an opened connection),
+                    so it can lock each instance for itself.
+    :param now: The current time, defaults to `time.time()`.
+
+    :returns: A `tuple` of the number of instances checked and the
+              number removed.
+    """
+    return storage.sweep(
+        (SHELVE_INSTANCE_PREFIX, SHELVE_FINISHED_PREFIX),
+        state_expired,
+        time.time() if now is None else now
+    )
+
+def green_threads():
+    """
+    :returns: True if threads are gevent's green threads, because the
+              standard library has been patched (e.g. by Gunicorn's
+              gevent workers).
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+
+    return monkey.is_module_patched('threading')
+
+
+class QuestionPool(object):
+    """
+    Questions of one type, ready to be asked. The pool is refilled by
+    a background thread so asking a question is usually just taking
+    one from the pool.
+
+    With gevent's green threads a refill would keep every other green
+    thread waiting until it's done (creating questions never waits for
+    anything), so it's run by a real thread from gevent's threadpool
+    instead.
+
+    :param question_type: The question's class, called with no
+                          arguments to create a question. Its `many`
+                          creates the questions to refill the pool
+                          with.
+    :param size: Number of questions kept ready.
+    """
+    def __init__(self, question_type, size=QUESTION_POOL_SIZE):
+        self.question_type = question_type
+        self.size = size
+        self._ready = deque()
+        self._wanted = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        # The threadpool's refill, with green threads.
+        self._filling = None
+
+    def __len__(self):
+        return len(self._ready)
+
+    def get(self):
+        """
+        :returns: A question from the pool or, if it's empty, a new
+                  one.
+        """
+        try:
+            question = self._ready.popleft()
+        except IndexError:
+            question = self.question_type()
+
+        if green_threads():
+            self._fill_async()
+        else:
+            self._start()
+            self._wanted.set()
+        return question
+
+    def _start(self):
+        """
+        Start the refill thread, unless it's already running in this
+        process (threads don't survive a fork).
+        """
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._refill)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _fill_async(self):
+        """
+        Fill the pool in gevent's threadpool, unless it's already
+        being filled in this process.
+        """
+        import gevent
+
+        with self._lock:
+            if self._filling is not None and\
+               self._pid == os.getpid() and not self._filling.ready():
+                return
+
+            self._pid = os.getpid()
+            self._filling = gevent.get_hub().threadpool.spawn(self._fill)
+
+    def _fill(self):
+        """
+        Fill the pool up to its size.
+        """
+        wanted = self.size - len(self._ready)
+        if wanted > 0:
+            self._ready.extend(self.question_type.many(wanted))
+
+    def _refill(self):
+        """
+        Fill the pool whenever questions are taken from it.
+        """
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            self._fill()
+
+
+class QuestionCache(object):
+    """
+    The most recently asked questions, by their type and seed.
+
+    Questions are copied in and out, so answering one doesn't change
+    the cached question.
+
+    :param size: Number of questions kept.
+    """
+    def __init__(self, size=QUESTION_CACHE_SIZE):
+        self.size = size
+        self._questions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, question):
+        """
+        :param question: A question, with its `seed`, not yet
+                         answered.
+        """
+        key = (type(question), question.seed)
+
+        with self._lock:
+            self._questions.pop(key, None)
+            self._questions[key] = copy.copy(question)
+
+            while len(self._questions) > self.size:
+                self._questions.popitem(last=False)
+
+    def get(self, question_type, seed):
+        """
+        :param question_type: The question's class.
+        :param seed: The question's seed.
+
+        :returns: A copy of the question or None if it's not cached.
+        """
+        key = (question_type, seed)
+
+        with self._lock:
+            question = self._questions.pop(key, None)
+            if question is None:
+                return None
+            # Most recently used go last.
+            self._questions[key] = question
+
+        return copy.copy(question)
+
+
+# `QuestionPool`s by question type.
+question_pools = {}
+recent_questions = QuestionCache()
+
+def new_question(question_type):
+    """
+    :param question_type: The question's class.
+
+    :returns: A new question from `question_type`'s pool.
+    """
+    pool = question_pools.get(question_type)
+    if pool is None:
+        pool = question_pools.setdefault(
+            question_type, QuestionPool(question_type)
+        )
+
+    question = pool.get()
+    recent_questions.add(question)
+    return question
+
+def recreate_question(question_type, seed):
+    """
+    :param question_type: The question's class.
+    :param seed: The question's seed.
+
+    :returns: The question with `seed`, from `recent_questions` if
+              it's there.
+    """
+    question = recent_questions.get(question_type, seed)
+    if question is None:
+        question = question_type(seed)
+        recent_questions.add(question)
+    return question
+
 def load_quiz(quiz_module):
     """
     Load Quiz class for given module.
@@ -58,23 +309,34 @@ def load_quiz(quiz_module):
 class BaseQuiz(object):
     """
     Base Quiz object that all Quiz objects MUST inherit from.
+
+    :ivar modified: True if the instance has changed since it was
+                    loaded and needs saving. Quizzes MUST set this
+                    when answering a GET request changes them.
+    :ivar token: Tells the instance apart, even when it has no ID
+                 (i.e. it's only stored in the cookie).
+    :ivar expires: The time the loaded state expires, or None.
     """
     def __init__(self):
         self.ended = False
+        self.modified = True
+        self.token = uuid.uuid4().hex
+        self.expires = None
 
     @classmethod
-    def create_new(cls, shelve):
+    def create_new(cls, shelve, ttl=None):
         """
         Create new instance of `cls` and save in shelve.
 
         :param shelve: The open shelve (file) from flask-shelves.
+        :param ttl: Seconds until the instance expires.
 
         :returns: The Quiz instance's ID.
         """
-        return cls().save(shelve)
+        return cls().save(shelve, ttl)
 
-    @staticmethod
-    def get_instance(shelve, id_):
+    @classmethod
+    def get_instance(cls, shelve, id_):
         """
         Get instance from the shelve file.
 
@@ -82,18 +344,91 @@ class BaseQuiz(object):
         :param id_: The Quiz instance's ID.
 
         :returns: Quiz instance.
+
+        :raises KeyError: When there is no instance with `id_` (or
+                          it was saved with a different
+                          `STATE_VERSION`).
+        """
+        quiz = cls.load_state(shelve[SHELVE_INSTANCE_PREFIX + str(id_)])
+
+        if quiz is None:
+            raise KeyError(id_)
+
+        quiz._id = str(id_)
+        return quiz
+
+    def dump_state(self, ttl=None):
         """
-        return shelve[SHELVE_INSTANCE_PREFIX + str(id_)]
+        Create the state to store, with when it expires.
+
+        :param ttl: Seconds until the state expires, or None to
+                    never expire.
+
+        :returns: A `dict` from `to_state` with an 'expires' time.
+        """
+        state = self.to_state()
+        state['expires'] = None if ttl is None else time.time() + ttl
+        return state
 
     @classmethod
-    def remove_instance(cls, shelve, id_):
+    def load_state(cls, state):
+        """
+        Recreate an instance from a stored `state`, checking it was
+        created with the current `STATE_VERSION` and has not expired.
+
+        :param state: A `dict` from `dump_state`.
+
+        :returns: Quiz instance or None if `state` is not valid.
+        """
+        if state_expired(state):
+            return None
+
+        quiz = cls.from_state(state)
+        quiz.modified = False
+        quiz.expires = state.get('expires')
+        return quiz
+
+    @staticmethod
+    def remove_instance(shelve, id_):
         """
         Remove instance from shelve file.
 
         :param shelve: The open shelve (file) from flask-shelve.
         :param id_: The Quiz instance's ID.
         """
-        cls.get_instance(shelve, id_).remove(shelve)
+        del shelve[SHELVE_INSTANCE_PREFIX + str(id_)]
+
+    def to_state(self):
+        """
+        Create the state that gets stored for the instance.
+
+        Child classes extend the state with anything else needed to
+        recreate them. It must only contain simple types (e.g.
+        `dict`, `list`, `int` and `str`) so it's quick to
+        serialize and small to store.
+
+        :returns: A `dict` of the instance's state.
+        """
+        return dict(version=STATE_VERSION, ended=self.ended,
+                    token=self.token)
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Recreate an instance from `state`.
+
+        Child classes extend this to restore anything they added in
+        `to_state`.
+
+        :param state: A `dict` from `to_state`.
+
+        :returns: Quiz instance.
+        """
+        quiz = cls.__new__(cls)
+        quiz.ended = state['ended']
+        quiz.token = str(state['token'])
+        quiz.expires = None
+        return quiz
 
     def id(self, shelve):
         """
@@ -122,18 +457,48 @@ class BaseQuiz(object):
 
         return new_id
 
-    def save(self, shelve):
+    def save(self, shelve, ttl=None):
         """
         Save instance to shelve file.
 
         :param shelve: The open shelve (file) from flask-shelve.
+        :param ttl: Seconds until the instance expires.
 
         :returns: The Quiz instance's ID.
         """
         id_ = self.id(shelve)
-        shelve[SHELVE_INSTANCE_PREFIX + id_] = self
+        shelve[SHELVE_INSTANCE_PREFIX + id_] = self.dump_state(ttl)
         return id_
 
+    def claim_finish(self, shelve):
+        """
+        Record that an instance stored in the cookie has finished, so
+        it can only finish once (e.g. not again by sending an old
+        cookie back). Instances in the storage don't need this, they
+        are removed once finished.
+
+        The record is kept until the instance would have expired (or
+        for `FINISHED_TTL` if it never does), when `sweep_instances`
+        removes it.
+
+        :param shelve: The open shelve (file) from flask-shelve.
+
+        :returns: False if the instance had already finished.
+        """
+        key = SHELVE_FINISHED_PREFIX + self.token
+
+        expires = self.expires
+        if expires is None:
+            expires = time.time() + FINISHED_TTL
+
+        with shelve.locked(key):
+            if key in shelve:
+                return False
+
+            shelve[key] = dict(version=STATE_VERSION, expires=expires)
+
+        return True
+
     def remove(self, shelve):
         """
         Remove instance from shelve file.
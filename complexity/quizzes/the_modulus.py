@@ -12,14 +12,19 @@ import random
 
 from flask import request
 
-from . import BaseQuiz
+from . import BaseQuiz, new_question, recreate_question
+from ..batch import ProductBatch, DivisionBatch, new_seeds
 from ..maths import *
+from ..maths import DEFAULT_FORMAT
+from ..maths.formats import symbols
 from ..maths.complex import (compute_modulus, compute_product,
                              compute_divide)
 from ..errors import BadRequestError
+from ..seeded import SeededRandom
 
-class DuplicateAnswerError(Exception):
-    pass
+# Number of steps either side of the correct answer that wrong
+# answers are chosen from.
+WRONG_STEPS = 10
 
 class MultipleChoiceQuestion(object):
     """
@@ -28,32 +33,135 @@ class MultipleChoiceQuestion(object):
     Each question has three parts. For each part, a choice of
     three answers is provided; a correct one and two wrong ones.
 
-    Once inherited the child class has to define the following
-    instance varibles:
+    Everything random about a question comes from `self.random`,
+    seeded with `seed`, so the same seed always recreates the same
+    question (and the same as its row in a `batch_type` batch).
 
-    :ivar data: Dictionary of variable definitions needed to answer
-                the question.
+    Once inherited the child class has to define a `build` method
+    which defines the following instance varibles:
+
+    :ivar variables: Dictionary of the `MathOperand`s for the
+                     variables needed to answer the question, by
+                     name.
 
     :ivar parts: A list of `tuple`s for each part of the question.
                  The first element being the `MathOperand`
                  representing the question and the second a list of
                  `MathOperand`s containing the correct answer
                  followed by two incorrect answers.
+
+    :param seed: Seed for the question's random numbers. A random
+                 one is used if not provided.
+
+    :cvar batch_type: The `batch.QuestionBatch` that generates many
+                      of the questions at once, if there is one.
     """
-    def __init__(self):
+    batch_type = None
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+
+        self.seed = seed
+        self.random = SeededRandom(seed)
         self.answered = False
         self.score = 0
         self.results = []
 
+        self.build()
+
         # Cache Question.
-        try:
-            self.question
-        except DuplicateAnswerError:
-            self.__dict__ = {}
-            self.__init__()
+        self.question
+
+    @classmethod
+    def prepared(cls, seed, data, question):
+        """
+        A question that has already been rendered (e.g. by a batch),
+        only built when more than `data` and `question` are used.
+
+        :param seed: The question's seed.
+        :param data: The question's `data`.
+        :param question: The question's `question`.
+
+        :returns: Question instance.
+        """
+        prepared = cls.__new__(cls)
+        prepared.seed = seed
+        prepared.answered = False
+        prepared.score = 0
+        prepared.results = []
+        prepared._data = data
+        prepared._question = question
+        return prepared
+
+    @classmethod
+    def many(cls, count):
+        """
+        :param count: Number of questions.
+
+        :returns: A `list` of `count` new questions, generated
+                  together by `batch_type` when NumPy is installed.
+        """
+        if cls.batch_type is None or not cls.batch_type.available():
+            return [cls() for _ in xrange(count)]
+
+        batch = cls.batch_type(cls, new_seeds(count))
+        return [batch.question(index) for index in xrange(count)]
+
+    def __getattr__(self, name):
+        # Build a `prepared` question the first time anything it
+        # doesn't have yet is used.
+        if name.startswith('_') or 'random' in self.__dict__:
+            raise AttributeError(name)
+
+        self.random = SeededRandom(self.seed)
+        self.build()
+        return getattr(self, name)
+
+    def build(self):
+        """
+        Define `self.data` and `self.parts`.
+        """
+        raise NotImplementedError
+
+    def wrong_values(self, correct, scale=1.0, count=2):
+        """
+        Choose different wrong values near `correct`. They are taken
+        without replacement from the values `WRONG_STEPS` steps
+        either side of `correct`, so they never need choosing again.
+
+        :param correct: The correct value.
+        :param scale: The size of each step as a fraction of
+                      `correct`, it's always at least 1.
+        :param count: The number of wrong values.
+
+        :returns: A `list` of `count` different values, none of them
+                  `correct`.
+        """
+        step = max(int(correct * scale), 1)
+        values = [
+            correct + step*i
+            for i in xrange(-WRONG_STEPS, WRONG_STEPS) if i != 0
+        ]
+        return self.random.sample(values, count)
+
+    def near_value(self, correct, scale=1.0):
+        """
+        Choose any value near `correct` (which may be `correct`), from
+        the same values as `wrong_values`.
+
+        :param correct: The correct value.
+        :param scale: The size of each step as a fraction of
+                      `correct`.
+
+        :returns: The value.
+        """
+        step = max(int(correct * scale), 1)
+        return correct + step*self.random.randrange(
+            -WRONG_STEPS, WRONG_STEPS
+        )
 
-    @staticmethod
-    def _make_part(part):
+    def _make_part(self, part):
         """
         Renders an randomises part and puts it into the correct
         format to be sent.
@@ -67,17 +175,17 @@ class MultipleChoiceQuestion(object):
         question, answers = part
 
         # Render the question.
-        question = question.render()
+        question = question.render(random=self.random)
         # Render the possible answers.
-        answers = map(lambda expr: str(expr.render()), answers)
-
-        if len(answers) != len(set(answers)):
-            raise DuplicateAnswerError
+        answers = map(
+            lambda expr: str(expr.render(random=self.random)),
+            answers
+        )
 
         # Take out the correct answer.
         correct_answer = answers.pop(0)
         # Choose a random index.
-        correct_answer_index = random.randrange(0, 3)
+        correct_answer_index = self.random.randrange(0, 3)
         # Place the correct answer in at that random index.
         answers.insert(correct_answer_index, correct_answer)
 
@@ -96,13 +204,63 @@ class MultipleChoiceQuestion(object):
 
         return self._question
 
-    def ask(self):
+    @property
+    def data(self):
+        """
+        :returns: `self.variables` rendered.
         """
+        if not hasattr(self, '_data'):
+            self._data = {
+                name: variable.render()
+                for name, variable in self.variables.items()
+            }
+
+        return self._data
+
+    def render(self, format_=DEFAULT_FORMAT):
+        """
+        Render the question, with the answers in the same order as
+        `self.question`.
+
+        :param format_: The format to render (from `FORMATS`).
+
+        :returns: The data and question like `self.data` and
+                  `self.question`.
+        """
+        if format_ == DEFAULT_FORMAT:
+            return self.data, self.question
+
+        data = {
+            name: variable.render(format_=format_)
+            for name, variable in self.variables.items()
+        }
+
+        question = []
+        for (expression, answers), part in zip(self.parts,
+                                               self.question):
+            correct = part[2]
+            answers = [
+                str(answer.render(format_=format_))
+                for answer in answers
+            ]
+            answers.insert(correct, answers.pop(0))
+
+            question.append(
+                (expression.render(format_=format_), answers, correct)
+            )
+
+        return data, question
+
+    def ask(self, format_=DEFAULT_FORMAT):
+        """
+        :param format_: The format to render (from `FORMATS`).
+
         :returns: The whole question to be asked with data.
         """
+        data, question = self.render(format_)
         return dict(
-            data=self.data,
-            question=self.question
+            data=data,
+            question=question
         )
 
     def answer(self, request_data):
@@ -121,7 +279,7 @@ class MultipleChoiceQuestion(object):
         answer = request_data['answer']
 
         # Process each part.
-        for i in xrange(len(self.parts)):
+        for i in xrange(len(self.question)):
 
             correct = answer[i][0] == self._question[i][2]
 
@@ -135,40 +293,87 @@ class MultipleChoiceQuestion(object):
         self.answered = True
         return self.score, self.results
 
+    def __copy__(self):
+        """
+        Copy the question, sharing everything but the answers.
+        """
+        question = self.__class__.__new__(self.__class__)
+        question.__dict__.update(self.__dict__)
+        question.results = list(self.results)
+        return question
+
+    def to_state(self):
+        """
+        :returns: A `dict` with just enough to recreate the question;
+                  its seed and answers.
+        """
+        return dict(
+            seed=self.seed,
+            answered=self.answered,
+            score=self.score,
+            results=self.results
+        )
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Recreate a question from `to_state`.
+
+        :param state: A `dict` from `to_state`.
+
+        :returns: Question instance.
+        """
+        question = recreate_question(cls, state['seed'])
+        question.answered = state['answered']
+        question.score = state['score']
+        question.results = state['results']
+        return question
+
 
 class ModulusProductQuestion(MultipleChoiceQuestion):
     """
     Question for the modulus's product.
     """
-    def __init__(self, *args, **kwargs):
-        # Variables used to represent questions.
-        self.z_var = MathsVariable('z')
-        self.w_var = MathsVariable('w')
-        self.zw_var = MathsExpression([
-                self.z_var,
-                self.w_var
-            ],
-            operators.multiply
-        )
+    batch_type = ProductBatch
+
+    # Variables used to represent questions.
+    z_var = shared_variable('z')
+    w_var = shared_variable('w')
+    zw_var = shared_expression([
+            z_var,
+            w_var
+        ],
+        operators.multiply
+    )
+    # |z| and |w|
+    z_mod_var = shared_expression(z_var, operators.abs)
+    w_mod_var = shared_expression(w_var, operators.abs)
+    zw_mod_var = shared_expression(zw_var, operators.abs)
+    z_mod_w_mod_var = shared_expression([
+            z_mod_var,
+            w_mod_var
+        ],
+        operators.multiply
+    )
 
+    def build(self):
         # Per-Question random variable definitions.
         self.z = MathsComplexNumber(
             MathsRandomConstant(1, 11),
-            MathsRandomConstant(1, 11)
+            MathsRandomConstant(1, 11),
+            random=self.random
         )
         self.w = MathsComplexNumber(
             MathsRandomConstant(1, 11),
-            MathsRandomConstant(1, 11)
+            MathsRandomConstant(1, 11),
+            random=self.random
         )
         self.zw = compute_product(self.z, self.w)
 
         # Required `MultipleChoiceQuestion` instance varibles.
-        self.data = dict(z=self.z.render(), w=self.w.render())
+        self.variables = dict(z=self.z, w=self.w)
         self.parts = [self.part_one, self.part_two, self.part_three]
 
-        # Call the inherited class's __init__
-        super(ModulusProductQuestion, self).__init__(*args, **kwargs)
-
     @property
     def part_one(self):
         """
@@ -180,27 +385,12 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
 
         def answers():
 
-            # Compute vars for random number generation.
-            # For both the real part...
-            step_re = int(self.zw.re * 0.1)
-            if step_re < 1:
-                step_re = 1
-            start_re = int(self.zw.re - step_re*10)
-            end_re = int(self.zw.re + step_re*10)
-
-            # ....and imaginary part.
-            step_im = int(self.zw.im * 0.1)
-            if step_im < 1:
-                step_im = 1
-            start_im = int(self.zw.im - step_im*10)
-            end_im = int(self.zw.im + step_im*10)
-
-            # Generate wrong answers.
+            # Generate wrong answers, with different real parts.
             wrong_answers = [
                 MathsComplexNumber(
-                    MathsRandomConstant(start_re, end_re, step_re),
-                    MathsRandomConstant(start_im, end_im, step_im)
-                ) for _ in xrange(2)
+                    MathsConstant(re),
+                    MathsConstant(self.near_value(self.zw.im, 0.1))
+                ) for re in self.wrong_values(self.zw.re, 0.1)
             ]
 
             return [self.zw] + wrong_answers
@@ -230,19 +420,12 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
             # Remove the square root.
             zw_mod_squared = zw_mod.operands[0]
 
-            # Compute vars for random number generation.
-            step = int(zw_mod_squared.render() * 0.1)
-            if step < 1:
-                step = 1
-            start = int(zw_mod_squared.render() - step*10)
-            end = int(zw_mod_squared.render() + step*10)
-
-            # Generate random numbers.
+            # Generate wrong answers.
             wrong_answers = [
-                MathsExpression(
-                    MathsRandomConstant(start, end, step),
-                    operators.sqrt
-                ) for _ in xrange(2)
+                shared_expression(shared_constant(value), operators.sqrt)
+                for value in self.wrong_values(
+                    zw_mod_squared.evaluate(), 0.1
+                )
             ]
 
             return [zw_mod] + wrong_answers
@@ -251,10 +434,7 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
         # for the same question instance.
         if not hasattr(self, '_part_two'):
             # question = '|zw|'
-            question = MathsExpression(
-                self.zw_var,
-                operators.abs
-            )
+            question = self.zw_mod_var
 
             self._part_two = question, answers()
 
@@ -277,22 +457,8 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
         # to clearly separate the logic for each.
 
         def question():
-            # |z|
-            z_mod_var = MathsExpression([
-                    MathsVariable('z'),
-                ], operators.abs
-            )
-            # |w|
-            w_mod_var = MathsExpression([
-                    MathsVariable('w'),
-                ], operators.abs
-            )
-
             # |z||w|
-            return MathsExpression([
-                    z_mod_var, w_mod_var
-                ], operators.multiply
-            )
+            return self.z_mod_w_mod_var
 
         def answers():
             # |a + bj| = sqrt(a*a + b*b)
@@ -304,29 +470,22 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
             w_mod_squared = w_mod.operands[0]
 
             # |a + bj|^2 |c + dj|^2 = (a*a + b*b)(c*c + d*d)
-            z_mod_squared_w_mod_squared = MathsConstant(
-                z_mod_squared.render() * w_mod_squared.render()
+            z_mod_squared_w_mod_squared = shared_constant(
+                z_mod_squared.evaluate() * w_mod_squared.evaluate()
             )
 
             # |a + bj||c + dj| = sqrt[ (a*a + b*b) (c*c + d*d) ]
-            z_mod_w_mod = MathsExpression(
+            z_mod_w_mod = shared_expression(
                 z_mod_squared_w_mod_squared,
                 operators.sqrt
             )
 
-            # Compute vars for random numbers.
-            step = int(z_mod_squared_w_mod_squared.render() * 0.1)
-            if step < 1:
-                step = 1
-            start = int(z_mod_squared_w_mod_squared.render() - step*10)
-            end = int(z_mod_squared_w_mod_squared.render() + step*10)
-
             # Generate wrong answers.
             wrong_answers = [
-                MathsExpression(
-                    MathsRandomConstant(start, end, step),
-                    operators.sqrt
-                ) for _ in xrange(2)
+                shared_expression(shared_constant(value), operators.sqrt)
+                for value in self.wrong_values(
+                    z_mod_squared_w_mod_squared.evaluate(), 0.1
+                )
             ]
 
             return [z_mod_w_mod] + wrong_answers
@@ -338,36 +497,40 @@ class ModulusProductQuestion(MultipleChoiceQuestion):
 
         return self._part_three
 
-    def pattern(self, user_answer=None):
+    def pattern(self, user_answer=None, format_=DEFAULT_FORMAT):
         """
         Ask about the pattern in the question.
 
-        :param user_answer: The user's answer.
+        :param user_answer: The user's answer, in any format.
+        :param format_: The format to render the answers.
 
         :returns: Possible answers or, if `user_answer` is provided,
                    whether the user is correct.
         """
         # Helper function
-        equal = lambda exp1, exp2: '{} = {}'.format(exp1.render(),
-                                                    exp2.render())
+        equal = lambda exp1, exp2, format_=format_: symbols(
+            format_
+        )['equals'].format(exp1.render(format_=format_),
+                           exp2.render(format_=format_))
 
         # A few algebraic expressions.
-        z_mod_var = MathsExpression(self.z_var, operators.abs)
-        w_mod_var = MathsExpression(self.w_var, operators.abs)
-        z_mod_w_mod_var = MathsExpression([
-            z_mod_var,
-            w_mod_var
-        ])
-        zw_mod_var = MathsExpression(self.zw_var, operators.abs)
+        z_mod_var = self.z_mod_var
+        w_mod_var = self.w_mod_var
+        z_mod_w_mod_var = self.z_mod_w_mod_var
+        zw_mod_var = self.zw_mod_var
 
         # The possible answers
-        correct_answer = equal(zw_mod_var, z_mod_w_mod_var)
+        correct_vars = zw_mod_var, z_mod_w_mod_var
+        correct_answer = equal(*correct_vars)
         incorrect_answer_one = equal(z_mod_var, w_mod_var)
         incorrect_answer_two = equal(z_mod_var, zw_mod_var)
 
         # If answering the question return the result.
         if user_answer is not None:
-            return correct_answer == user_answer
+            return user_answer in [
+                equal(*correct_vars, format_=answer_format)
+                for answer_format in FORMATS
+            ]
 
         # Shuffle answers.
         answers = [
@@ -384,38 +547,46 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
     """
     Question for division with the modulus.
     """
-    def __init__(self, *args, **kwargs):
-        # Variables used to represent questions.
-        self.z_var = MathsVariable('z')
-        self.w_var = MathsVariable('w')
-        self.z_div_w_var = MathsExpression([
-                self.z_var,
-                self.w_var
-            ],
-            operators.divide
-        )
+    batch_type = DivisionBatch
+
+    # Variables used to represent questions.
+    z_var = shared_variable('z')
+    w_var = shared_variable('w')
+    z_div_w_var = shared_expression([
+            z_var,
+            w_var
+        ],
+        operators.divide
+    )
+    # |z| and |w|
+    z_mod_var = shared_expression(z_var, operators.abs)
+    w_mod_var = shared_expression(w_var, operators.abs)
+    z_div_w_mod_var = shared_expression(z_div_w_var, operators.abs)
+    z_mod_div_w_mod_var = shared_expression([
+            z_mod_var,
+            w_mod_var
+        ],
+        operators.divide
+    )
 
+    def build(self):
         # Per-Question random variable definitions.
         self.z = MathsComplexNumber(
             MathsRandomConstant(1, 11),
-            MathsRandomConstant(1, 11)
+            MathsRandomConstant(1, 11),
+            random=self.random
         )
         self.w = MathsComplexNumber(
             MathsRandomConstant(1, 11),
-            MathsRandomConstant(1, 11)
+            MathsRandomConstant(1, 11),
+            random=self.random
         )
         self.z_div_w = compute_divide(self.z, self.w)
 
         # Required `MultipleChoiceQuestion` instance varibles.
-        self.data = dict(z=self.z.render(), w=self.w.render())
+        self.variables = dict(z=self.z, w=self.w)
         self.parts = [self.part_one, self.part_two, self.part_three]
 
-        # Call the inherited class's __init__
-        super(
-            ModulusDivisionQuestion,
-            self
-        ).__init__(*args, **kwargs)
-
     @property
     def part_one(self):
         """
@@ -427,27 +598,12 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
 
         def answers():
 
-            # Compute vars for random number generation.
-            # For both the real part...
-            step_re = int(self.z_div_w.re)
-            if step_re < 1:
-                step_re = 1
-            start_re = int(self.z_div_w.re - step_re*10)
-            end_re = int(self.z_div_w.re + step_re*10)
-
-            # ....and imaginary part.
-            step_im = int(self.z_div_w.im)
-            if step_im < 1:
-                step_im = 1
-            start_im = int(self.z_div_w.im - step_im*10)
-            end_im = int(self.z_div_w.im + step_im*10)
-
-            # Generate wrong answers.
+            # Generate wrong answers, with different real parts.
             wrong_answers = [
                 MathsComplexNumber(
-                    MathsRandomConstant(start_re, end_re, step_re),
-                    MathsRandomConstant(start_im, end_im, step_im)
-                ) for _ in xrange(2)
+                    MathsConstant(re),
+                    MathsConstant(self.near_value(self.z_div_w.im))
+                ) for re in self.wrong_values(self.z_div_w.re)
             ]
 
             return [self.z_div_w] + wrong_answers
@@ -477,19 +633,12 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
             # Remove the square root.
             z_div_w_mod_squared = z_div_w_mod.operands[0]
 
-            # Compute vars for random number generation.
-            step = int(z_div_w_mod_squared.render())
-            if step < 1:
-                step = 1
-            start = int(z_div_w_mod_squared.render() - step*10)
-            end = int(z_div_w_mod_squared.render() + step*10)
-
-            # Generate random numbers.
+            # Generate wrong answers.
             wrong_answers = [
-                MathsExpression(
-                    MathsRandomConstant(start, end, step),
-                    operators.sqrt
-                ) for _ in xrange(2)
+                shared_expression(shared_constant(value), operators.sqrt)
+                for value in self.wrong_values(
+                    z_div_w_mod_squared.evaluate()
+                )
             ]
 
             return [z_div_w_mod] + wrong_answers
@@ -498,10 +647,7 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
         # for the same question instance.
         if not hasattr(self, '_part_two'):
             # question = '|zw|'
-            question = MathsExpression(
-                self.z_div_w_var,
-                operators.abs
-            )
+            question = self.z_div_w_mod_var
 
             self._part_two = question, answers()
 
@@ -524,40 +670,19 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
         # to clearly separate the logic for each.
 
         def question():
-            # |z|
-            z_mod_var = MathsExpression([
-                    MathsVariable('z'),
-                ], operators.abs
-            )
-            # |w|
-            w_mod_var = MathsExpression([
-                    MathsVariable('w'),
-                ], operators.abs
-            )
-
             # |z| / |w|
-            return MathsExpression([
-                    z_mod_var, w_mod_var
-                ], operators.divide
-            )
+            return self.z_mod_div_w_mod_var
 
         def answers():
             correct = self.part_two[1][0]
             correct_squared = correct.operands[0]
 
-            # Compute vars for random numbers.
-            step = int(correct_squared.render())
-            if step < 1:
-                step = 1
-            start = int(correct_squared.render() - step*10)
-            end = int(correct_squared.render() + step*10)
-
             # Generate wrong answers.
             wrong_answers = [
-                MathsExpression(
-                    MathsRandomConstant(start, end, step),
-                    operators.sqrt
-                ) for _ in xrange(2)
+                shared_expression(shared_constant(value), operators.sqrt)
+                for value in self.wrong_values(
+                    correct_squared.evaluate()
+                )
             ]
 
             return [correct] + wrong_answers
@@ -569,36 +694,40 @@ class ModulusDivisionQuestion(MultipleChoiceQuestion):
 
         return self._part_three
 
-    def pattern(self, user_answer=None):
+    def pattern(self, user_answer=None, format_=DEFAULT_FORMAT):
         """
         Ask about the pattern in the question.
 
-        :param user_answer: The user's answer.
+        :param user_answer: The user's answer, in any format.
+        :param format_: The format to render the answers.
 
         :returns: Possible answers or, if `user_answer` is provided,
                    whether the user is correct.
         """
         # Helper function
-        equal = lambda exp1, exp2: '{} = {}'.format(exp1.render(),
-                                                    exp2.render())
+        equal = lambda exp1, exp2, format_=format_: symbols(
+            format_
+        )['equals'].format(exp1.render(format_=format_),
+                           exp2.render(format_=format_))
 
         # A few algebraic expressions.
-        z_mod_var = MathsExpression(self.z_var, operators.abs)
-        w_mod_var = MathsExpression(self.w_var, operators.abs)
-        z_mod_div_w_mod_var = MathsExpression([
-            z_mod_var,
-            w_mod_var
-        ], operators.divide)
-        z_div_w_mod_var = MathsExpression(self.z_div_w_var, operators.abs)
+        z_mod_var = self.z_mod_var
+        w_mod_var = self.w_mod_var
+        z_mod_div_w_mod_var = self.z_mod_div_w_mod_var
+        z_div_w_mod_var = self.z_div_w_mod_var
 
         # The possible answers
-        correct_answer = equal(z_div_w_mod_var, z_mod_div_w_mod_var)
+        correct_vars = z_div_w_mod_var, z_mod_div_w_mod_var
+        correct_answer = equal(*correct_vars)
         incorrect_answer_one = equal(z_mod_var, w_mod_var)
         incorrect_answer_two = equal(z_mod_var, z_div_w_mod_var)
 
         # If answering the question return the result.
         if user_answer is not None:
-            return correct_answer == user_answer
+            return user_answer in [
+                equal(*correct_vars, format_=answer_format)
+                for answer_format in FORMATS
+            ]
 
         # Shuffle answers.
         answers = [
@@ -620,6 +749,10 @@ class PatternState(object):
     not_spotted, spotted, confirmed = range(3)
 
 
+# Question types by the index used to store them.
+QUESTION_TYPES = [ModulusProductQuestion, ModulusDivisionQuestion]
+
+
 class Quiz(BaseQuiz):
     """
     The Modulus Quiz.
@@ -641,9 +774,12 @@ class Quiz(BaseQuiz):
         self.pattern = PatternState.not_spotted
         super(Quiz, self).__init__()
 
-    def next(self, json=None):
+    def next(self, json=None, format_=DEFAULT_FORMAT):
         """
         Handle request to '/the_modulus/_next'.
+
+        :param json: The request's data.
+        :param format_: The format to render maths (from `FORMATS`).
         """
         if self.pattern == PatternState.not_spotted and\
            self.question is None:
@@ -653,7 +789,7 @@ class Quiz(BaseQuiz):
         return {
             'GET': self.get_question,
             'POST': self.answer_question,
-        }[request.method](json)
+        }[request.method](json, format_)
 
     @property
     def question(self):
@@ -679,10 +815,11 @@ class Quiz(BaseQuiz):
 
         # Create new instance of `self._Question` at `self._question`
         self.repeat_count += 1
-        self._question = self._Question()
+        self._question = new_question(self._Question)
+        self.modified = True
         return self._question
 
-    def get_question(self, _=None):
+    def get_question(self, _=None, format_=DEFAULT_FORMAT):
         """
         Handle: GET /the_modulus/_next
         """
@@ -694,11 +831,11 @@ class Quiz(BaseQuiz):
                 "been processed."
             )
 
-        response = self.question.ask()
+        response = self.question.ask(format_)
         response['finish'] = False
         return response
 
-    def answer_question(self, json):
+    def answer_question(self, json, format_=DEFAULT_FORMAT):
         """
         Handle: POST /the_modulus/_next
         """
@@ -717,7 +854,7 @@ class Quiz(BaseQuiz):
                 # an additional 5.
                 score = 5 + (
                     (self.repeat_limit - self.repeat_count) *
-                    len(self.question.parts) * 5
+                    len(self.question.question) * 5
                 )
 
                 if 'answer' not in json:
@@ -741,7 +878,9 @@ class Quiz(BaseQuiz):
                 # If they say they know the pattern, return the
                 # pattern question.
                 self.pattern = PatternState.confirmed
-                return dict(patterns=self.question.pattern())
+                return dict(
+                    patterns=self.question.pattern(format_=format_)
+                )
 
             # So they don't yet know the pattern.
             self.pattern = PatternState.not_spotted
@@ -776,10 +915,65 @@ class Quiz(BaseQuiz):
         Finish quiz, save scores
         """
         self.ended = True
+        self.modified = True
         if name is None:
             return dict(finish=True)
 
         return (self.score, name)
 
+    def to_state(self):
+        """
+        :returns: The quiz's state with question types stored by
+                  their index in `QUESTION_TYPES`.
+        """
+        state = super(Quiz, self).to_state()
+        state.update(
+            questions=[
+                (QUESTION_TYPES.index(Question), repeat_limit)
+                for Question, repeat_limit in self.questions
+            ],
+            repeat_limit=self.repeat_limit,
+            repeat_count=self.repeat_count,
+            score=self.score,
+            prev_resp_time=self.prev_resp_time,
+            pattern=self.pattern,
+            type=None,
+            question=None
+        )
+
+        if hasattr(self, '_Question'):
+            state['type'] = QUESTION_TYPES.index(self._Question)
+
+        if hasattr(self, '_question'):
+            state['question'] = self._question.to_state()
+
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Recreate the quiz from `to_state`.
+        """
+        quiz = super(Quiz, cls).from_state(state)
+        quiz.questions = [
+            (QUESTION_TYPES[index], repeat_limit)
+            for index, repeat_limit in state['questions']
+        ]
+        quiz.repeat_limit = state['repeat_limit']
+        quiz.repeat_count = state['repeat_count']
+        quiz.score = state['score']
+        quiz.prev_resp_time = state['prev_resp_time']
+        quiz.pattern = state['pattern']
+
+        if state['type'] is not None:
+            quiz._Question = QUESTION_TYPES[state['type']]
+
+            if state['question'] is not None:
+                quiz._question = quiz._Question.from_state(
+                    state['question']
+                )
+
+        return quiz
+
 
 
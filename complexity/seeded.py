@@ -0,0 +1,86 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: seeded.py
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Random numbers worked out from just a seed and how many numbers
+    have been drawn before, so many seeds can be drawn from at once
+    (see `batch.py`) and still agree with `SeededRandom`.
+
+"""
+
+MASK = (1 << 64) - 1
+
+# Constants for mixing a seed and index into a word (SplitMix64).
+SEED_MULTIPLIER = 0x9e3779b97f4a7c15
+INDEX_MULTIPLIER = 0xd1b54a32d192ed03
+MIX_MULTIPLIERS = (0xbf58476d1ce4e5b9, 0x94d049bb133111eb)
+MIX_SHIFTS = (30, 27, 31)
+
+def draw(seed, index):
+    """
+    :param seed: The seed, a non negative `int`.
+    :param index: The number of words drawn from `seed` before.
+
+    :returns: A random 64 bit word.
+    """
+    word = (seed * SEED_MULTIPLIER + (index + 1) * INDEX_MULTIPLIER) & MASK
+
+    for shift, multiplier in zip(MIX_SHIFTS, MIX_MULTIPLIERS):
+        word = ((word ^ (word >> shift)) * multiplier) & MASK
+
+    return word ^ (word >> MIX_SHIFTS[-1])
+
+
+class SeededRandom(object):
+    """
+    The parts of `random.Random` the questions use, drawing each
+    number from `draw`.
+
+    :param seed: The seed, a non negative `int`.
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.index = 0
+
+    def below(self, stop):
+        """
+        :returns: An `int` from 0 up to (not including) `stop`.
+        """
+        word = draw(self.seed, self.index)
+        self.index += 1
+        return int(word % stop)
+
+    def randrange(self, start, stop=None, step=1):
+        """
+        :returns: An `int` like `random.randrange`.
+        """
+        if stop is None:
+            start, stop = 0, start
+
+        count = (stop - start + step - 1) // step
+        if count <= 0:
+            raise ValueError("Empty range for randrange()")
+
+        return start + step*self.below(count)
+
+    def sample(self, population, count):
+        """
+        :returns: A `list` of `count` different items from
+                  `population`, like `random.sample`.
+        """
+        if not 0 <= count <= len(population):
+            raise ValueError("Sample larger than population")
+
+        chosen = []
+        for taken in xrange(count):
+            # Choose from the indices not yet chosen, then shift past
+            # the chosen ones.
+            index = self.below(len(population) - taken)
+            for earlier in sorted(chosen):
+                if index >= earlier:
+                    index += 1
+            chosen.append(index)
+
+        return [population[index] for index in chosen]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: serve.py
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Serve the application with Gunicorn's worker processes, each
+    handling requests with a pool of threads (or, served
+    asynchronously, gevent's green threads so one worker can wait on
+    thousands of requests at once). Sending the server HUP restarts
+    the workers gracefully, letting them finish their requests, and
+    TERM or INT stops them gracefully.
+
+    Gunicorn (and gevent) are optional, install them with the 'serve'
+    (and 'async') extras. Without Gunicorn, a single process with
+    Werkzeug's threaded server is all that's served.
+
+"""
+
+from werkzeug.serving import make_server
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+try:
+    import gevent
+except ImportError:
+    gevent = None
+
+
+def check_workers(app, workers):
+    """
+    Check the application's storage can be shared by `workers`
+    processes.
+
+    :param app: The application's instance.
+    :param workers: The number of worker processes.
+
+    :raises RuntimeError: When the storage is only kept inside a
+                          single process (e.g. the 'memory' backend).
+    """
+    storage = app.extensions['storage']
+
+    if workers > 1 and not storage.multiprocess:
+        raise RuntimeError(
+            "STORAGE_BACKEND '{}' can't be shared by {} worker "
+            "processes, use a single worker.".format(
+                app.config['STORAGE_BACKEND'], workers
+            )
+        )
+
+
+def serve(factory, host='127.0.0.1', port=5000, workers=1, threads=1,
+          preload=True, graceful_timeout=30, async_=False,
+          connections=1000):
+    """
+    Serve the application until the server is stopped.
+
+    :param factory: Function that creates the application's instance
+                    (e.g. `create_app`).
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param workers: The number of worker processes.
+    :param threads: The number of threads in each worker.
+    :param preload: Create the application before starting the
+                    workers, so they share its memory. Otherwise each
+                    worker creates its own.
+    :param graceful_timeout: Seconds workers get to finish their
+                             requests when restarting or stopping.
+    :param async_: Handle requests with green threads instead of
+                   `threads` threads. The storage should then poll
+                   for its locks (see `STORAGE_LOCK_POLL`) so waiting
+                   for one doesn't block the whole worker.
+    :param connections: The number of requests each worker handles
+                        at once when `async_`.
+
+    :raises RuntimeError: When the storage can't be shared by
+                          `workers` processes, or `async_` is used
+                          without Gunicorn and gevent installed.
+    """
+    if async_ and (BaseApplication is None or gevent is None):
+        raise RuntimeError("Gunicorn and gevent are needed to serve "
+                           "asynchronously.")
+
+    if BaseApplication is None:
+        server = fallback_server(factory, host, port)
+        print " * Gunicorn is not installed, serving on " \
+              "http://{}:{}/ with a single process".format(host, port)
+        server.serve_forever()
+        return
+
+    GunicornServer(factory, host, port, workers, threads, preload,
+                   graceful_timeout, async_, connections).run()
+
+
+def fallback_server(factory, host, port):
+    """
+    :returns: A Werkzeug server handling requests with a thread for
+              each, for when Gunicorn isn't installed.
+    """
+    return make_server(host, port, factory(), threaded=True)
+
+
+if BaseApplication is not None:
+    class GunicornServer(BaseApplication):
+        """
+        Serve the application with Gunicorn.
+
+        Takes the same parameters as `serve`.
+        """
+        def __init__(self, factory, host, port, workers, threads,
+                     preload, graceful_timeout, async_, connections):
+            self.factory = factory
+            self.workers = workers
+            self.options = dict(
+                bind='{}:{}'.format(host, port),
+                workers=workers,
+                threads=threads,
+                preload_app=preload,
+                graceful_timeout=graceful_timeout
+            )
+            if async_:
+                self.options['worker_class'] = 'gevent'
+                self.options['worker_connections'] = connections
+            elif threads > 1:
+                self.options['worker_class'] = 'gthread'
+
+            super(GunicornServer, self).__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            app = self.factory()
+            check_workers(app, self.workers)
+            return app
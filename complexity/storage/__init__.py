@@ -0,0 +1,57 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/__init__.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Pluggable storage backends for quiz instances and records.
+
+    The backend is chosen with the `STORAGE_BACKEND` config value.
+    Every backend opens a dictionary like object (with a `close`
+    method) so the rest of the application does not need to know
+    which one is being used.
+
+"""
+
+from flask import current_app
+
+from .shelf import ShelveStorage
+from .memory import MemoryStorage
+from .sqlite import SQLiteStorage
+from .sharded import ShardedStorage
+
+# Available backends by their `STORAGE_BACKEND` name.
+backends = {
+    'shelve': ShelveStorage,
+    'memory': MemoryStorage,
+    'sqlite': SQLiteStorage,
+    'sharded': ShardedStorage,
+}
+
+def init_app(app):
+    """
+    Create the storage backend for the application.
+
+    :param app: The application's instance.
+
+    :raises RuntimeError: When `STORAGE_BACKEND` is not a known
+                          backend.
+    """
+    backend = app.config.setdefault('STORAGE_BACKEND', 'shelve')
+
+    if backend not in backends:
+        raise RuntimeError(
+            "Unknown STORAGE_BACKEND '{}'.".format(backend)
+        )
+
+    app.extensions['storage'] = backends[backend](app)
+
+def open_storage(flag='c'):
+    """
+    Open the current application's storage.
+
+    :param flag: 'r' to only read, 'c' to read and write.
+
+    :returns: The opened storage.
+    """
+    return current_app.extensions['storage'].open(flag)
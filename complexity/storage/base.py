@@ -0,0 +1,167 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/base.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Base classes for storage backends.
+
+"""
+
+import cPickle
+from contextlib import contextmanager
+from UserDict import DictMixin
+
+
+class BaseStorage(object):
+    """
+    A storage backend. One instance exists for each application.
+
+    :ivar multiprocess: If several processes can share the storage.
+
+    :param app: The application's instance.
+    :cvar sweep_chunk: Number of keys `sweep` checks with each
+                       connection it opens for writing.
+    """
+    multiprocess = True
+    sweep_chunk = 100
+
+    def __init__(self, app):
+        self.app = app
+        self.protocol = app.config.get('SHELVE_PROTOCOL')
+        # Seconds between attempts to take a lock, or None to block.
+        self.poll = app.config.setdefault('STORAGE_LOCK_POLL', None)
+
+    def open(self, flag='c'):
+        """
+        Open the storage.
+
+        :param flag: 'r' to only read, 'c' to read and write.
+
+        :returns: A `StorageConnection` (or any other dictionary like
+                  object with a `close` method).
+        """
+        raise NotImplementedError
+
+    def sweep(self, prefixes, expired, now):
+        """
+        Remove the expired values with keys starting with `prefixes`.
+
+        The keys are listed first and then checked a few at a time,
+        each locked and read again before it's removed, so nobody
+        waits for the whole sweep.
+
+        :param prefixes: A `tuple` of the key prefixes to check.
+        :param expired: Function called with a value and `now`,
+                        returning True if the value has expired.
+        :param now: The current time.
+
+        :returns: A `tuple` of the number of keys checked and the
+                  number removed.
+        """
+        connection = self.open('r')
+        try:
+            keys = [
+                key for key in connection.keys()
+                if key.startswith(prefixes)
+            ]
+        finally:
+            connection.close()
+
+        return len(keys), self.sweep_keys(keys, expired, now)
+
+    def sweep_keys(self, keys, expired, now):
+        """
+        Remove `keys` whose values have expired, for `sweep`.
+
+        :returns: The number of keys removed.
+        """
+        removed = 0
+
+        for start in xrange(0, len(keys), self.sweep_chunk):
+            connection = self.open('c')
+            try:
+                for key in keys[start:start + self.sweep_chunk]:
+                    with connection.locked(key):
+                        try:
+                            if expired(connection[key], now):
+                                del connection[key]
+                                removed += 1
+                        except KeyError:
+                            # Already removed by someone else.
+                            pass
+            finally:
+                connection.close()
+
+        return removed
+
+    def dumps(self, value):
+        """
+        Serialize `value` in the same way `shelve` does.
+        """
+        return cPickle.dumps(value, self.protocol)
+
+    def loads(self, data):
+        """
+        Deserialize `data` created by `self.dumps`.
+        """
+        return cPickle.loads(data)
+
+
+class StorageConnection(DictMixin, object):
+    """
+    Dictionary like access to an opened storage backend.
+
+    Child classes need to define `__getitem__`, `__setitem__`,
+    `__delitem__` and `keys` (and `close` if anything needs
+    releasing, and `locked` and `get_many` if each operation does not
+    already hold the lock for the whole connection).
+
+    :param flag: The flag the storage was opened with.
+    """
+    def __init__(self, flag='c'):
+        self.flag = flag
+
+    @property
+    def writable(self):
+        """
+        :returns: True if the storage was opened for writing.
+        """
+        return self.flag in ('c', 'w', 'n')
+
+    def check_writable(self):
+        """
+        :raises IOError: When the storage is opened read only.
+        """
+        if not self.writable:
+            raise IOError("Storage opened read only.")
+
+    def get_many(self, keys, default=None):
+        """
+        Read `keys` together, so nobody writing can change some of
+        them in between. Child classes that only lock for each single
+        operation need to override this.
+
+        :param keys: The keys to read.
+        :param default: The value of any missing key.
+
+        :returns: A `list` of the values, in the same order as `keys`.
+        """
+        return [self.get(key, default) for key in keys]
+
+    @contextmanager
+    def locked(self, key):
+        """
+        Keep everyone else from writing `key` while it's read and
+        then written inside the `with` block.
+
+        :param key: The key that is going to be changed.
+        """
+        self.check_writable()
+        yield
+
+    def close(self):
+        """
+        Close the connection. Nothing to do by default.
+        """
+        pass
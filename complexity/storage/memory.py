@@ -0,0 +1,82 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/memory.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    In-process storage backend. Nothing is shared between processes
+    and everything is lost when the process ends, so it's only
+    suitable for testing or a single process server.
+
+"""
+
+from contextlib import contextmanager
+from threading import RLock
+
+from .base import BaseStorage, StorageConnection
+
+
+class MemoryStorage(BaseStorage):
+    """
+    Stores serialized values in a dictionary.
+
+    Values are serialized so that changing an object that has been
+    loaded does not change the stored copy, the same as every other
+    backend.
+    """
+    # Each process has its own dictionary.
+    multiprocess = False
+
+    def __init__(self, app):
+        super(MemoryStorage, self).__init__(app)
+        self.data = {}
+        self.lock = RLock()
+
+    def open(self, flag='c'):
+        return MemoryConnection(self, flag)
+
+
+class MemoryConnection(StorageConnection):
+    """
+    Access to a `MemoryStorage`. The lock is only held for each
+    single operation.
+
+    :param storage: The `MemoryStorage` instance.
+    """
+    def __init__(self, storage, flag='c'):
+        super(MemoryConnection, self).__init__(flag)
+        self.storage = storage
+
+    def __getitem__(self, key):
+        with self.storage.lock:
+            data = self.storage.data[key]
+        return self.storage.loads(data)
+
+    def __setitem__(self, key, value):
+        self.check_writable()
+        data = self.storage.dumps(value)
+        with self.storage.lock:
+            self.storage.data[key] = data
+
+    def __delitem__(self, key):
+        self.check_writable()
+        with self.storage.lock:
+            del self.storage.data[key]
+
+    def __contains__(self, key):
+        with self.storage.lock:
+            return key in self.storage.data
+
+    def keys(self):
+        with self.storage.lock:
+            return self.storage.data.keys()
+
+    def get_many(self, keys, default=None):
+        with self.storage.lock:
+            return [self.get(key, default) for key in keys]
+
+    @contextmanager
+    def locked(self, key):
+        self.check_writable()
+        with self.storage.lock:
+            yield
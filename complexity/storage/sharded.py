@@ -0,0 +1,160 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/sharded.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Storage backend spreading quiz instances across several shelve
+    files, each with its own lock.
+
+"""
+
+import zlib
+from contextlib import contextmanager
+
+from ..quizzes import SHELVE_INSTANCE_PREFIX
+from .base import BaseStorage, StorageConnection
+from .shelf import ShelveFile
+
+
+class ShardedStorage(BaseStorage):
+    """
+    Quiz instances are hashed by their key across `SHELVE_SHARDS`
+    shelve files named `SHELVE_FILENAME` followed by the shard's
+    number (e.g. 'complexity.bin.0'). Everything else (the records)
+    lives in its own 'complexity.bin.records' file.
+
+    Each shard is only locked for a single operation so two quiz
+    sessions only ever wait for each other when they happen to use
+    the same shard at the same time.
+    """
+    def __init__(self, app):
+        super(ShardedStorage, self).__init__(app)
+
+        if 'SHELVE_FILENAME' not in app.config:
+            raise RuntimeError("SHELVE_FILENAME is required in the "
+                               "app configuration.")
+
+        filename = app.config['SHELVE_FILENAME']
+        count = app.config.setdefault('SHELVE_SHARDS', 8)
+        if count < 1:
+            raise RuntimeError("SHELVE_SHARDS must be at least 1.")
+
+        self.shards = [
+            ShelveFile('{}.{}'.format(filename, i), self.protocol,
+                       poll=self.poll)
+            for i in xrange(count)
+        ]
+        self.records = ShelveFile(filename + '.records', self.protocol,
+                                  poll=self.poll)
+
+    def shard(self, key):
+        """
+        Find the shard for `key`.
+
+        :param key: The storage key.
+
+        :returns: The `ShelveFile` holding `key`.
+        """
+        if not key.startswith(SHELVE_INSTANCE_PREFIX):
+            return self.records
+
+        # `crc32` rather than `hash` so every process agrees.
+        index = (zlib.crc32(key) & 0xffffffff) % len(self.shards)
+        return self.shards[index]
+
+    def open(self, flag='c'):
+        return ShardedConnection(self, flag)
+
+
+class ShardedConnection(StorageConnection):
+    """
+    Access to a `ShardedStorage`.
+
+    :param storage: The `ShardedStorage` instance.
+    """
+    def __init__(self, storage, flag='c'):
+        super(ShardedConnection, self).__init__(flag)
+        self.storage = storage
+        # Shards held open by `locked`.
+        self._held = {}
+
+    @contextmanager
+    def _shelf(self, shard, flag):
+        """
+        Lock and open `shard` for a single operation (unless it's
+        already held by `locked`).
+        """
+        if shard in self._held:
+            yield self._held[shard]
+            return
+
+        shelf = shard.open(flag)
+        try:
+            yield shelf
+        finally:
+            shelf.close()
+
+    def __getitem__(self, key):
+        with self._shelf(self.storage.shard(key), 'r') as shelf:
+            return shelf[key]
+
+    def __setitem__(self, key, value):
+        self.check_writable()
+        with self._shelf(self.storage.shard(key), 'c') as shelf:
+            shelf[key] = value
+
+    def __delitem__(self, key):
+        self.check_writable()
+        with self._shelf(self.storage.shard(key), 'c') as shelf:
+            del shelf[key]
+
+    def __contains__(self, key):
+        with self._shelf(self.storage.shard(key), 'r') as shelf:
+            return key in shelf
+
+    def keys(self):
+        keys = []
+        for shard in self.storage.shards + [self.storage.records]:
+            with self._shelf(shard, 'r') as shelf:
+                keys.extend(shelf.keys())
+        return keys
+
+    def get_many(self, keys, default=None):
+        """
+        Hold every shard with one of `keys` open for reading (always
+        in the same order) until they've all been read.
+        """
+        shards = set(self.storage.shard(key) for key in keys)
+        opened = [
+            shard for shard in self.storage.shards + [self.storage.records]
+            if shard in shards and shard not in self._held
+        ]
+
+        try:
+            for shard in opened:
+                self._held[shard] = shard.open('r')
+            return [self.get(key, default) for key in keys]
+        finally:
+            for shard in opened:
+                if shard in self._held:
+                    self._held.pop(shard).close()
+
+    @contextmanager
+    def locked(self, key):
+        """
+        Hold the shard for `key` open for writing until the end of the
+        block.
+        """
+        self.check_writable()
+        shard = self.storage.shard(key)
+
+        if shard in self._held:
+            yield
+            return
+
+        self._held[shard] = shard.open('c')
+        try:
+            yield
+        finally:
+            self._held.pop(shard).close()
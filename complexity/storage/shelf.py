@@ -0,0 +1,184 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/shelf.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Storage backend for a single shelve file, guarded by one file
+    lock (the original storage used by Complexity).
+
+"""
+
+import os
+import time
+import errno
+import fcntl
+import shelve
+from contextlib import contextmanager
+
+import flask_shelve
+
+from .base import BaseStorage
+
+
+class LockedShelf(shelve.DbfilenameShelf):
+    """
+    A shelf that releases its lock once closed.
+
+    :param release: Function to release the lock.
+    """
+    def __init__(self, filename, flag, protocol, writeback, release):
+        shelve.DbfilenameShelf.__init__(
+            self, filename, flag, protocol, writeback
+        )
+        self.flag = flag
+        self._release = release
+
+    @contextmanager
+    def locked(self, key):
+        """
+        The write lock is already held for the whole time the shelf is
+        open, so there is nothing more to lock.
+        """
+        if self.flag not in ('c', 'w', 'n'):
+            raise IOError("Storage opened read only.")
+        yield
+
+    def get_many(self, keys, default=None):
+        """
+        The lock is held for the whole time the shelf is open, so
+        every key is read together anyway.
+        """
+        return [self.get(key, default) for key in keys]
+
+    def close(self):
+        shelve.DbfilenameShelf.close(self)
+
+        # Only release once.
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+
+class PollingFileLock(flask_shelve._FileLock):
+    """
+    A file lock that never blocks the process while it waits. Instead
+    it tries to take the lock every `poll` seconds and sleeps in
+    between, so a cooperative (e.g. gevent) worker can handle other
+    requests while it waits.
+
+    :param lockfile: The lock's filename.
+    :param poll: Seconds between attempts.
+    """
+    def __init__(self, lockfile, poll):
+        flask_shelve._FileLock.__init__(self, lockfile)
+        self.poll = poll
+
+    def _acquire(self, operation):
+        fileno = os.open(self._filename, os.O_RDWR)
+
+        while True:
+            try:
+                fcntl.flock(fileno, operation | fcntl.LOCK_NB)
+                return fileno
+            except IOError as error:
+                if error.errno not in (errno.EAGAIN, errno.EACCES):
+                    os.close(fileno)
+                    raise
+            time.sleep(self.poll)
+
+    def acquire_read_lock(self):
+        # Let waiting writers go first, the same as `_FileLock`.
+        while self._waiting_for_write_lock:
+            time.sleep(self.poll)
+
+        self._waiting_for_read_lock = True
+        try:
+            return self._acquire(fcntl.LOCK_SH)
+        finally:
+            self._waiting_for_read_lock = False
+
+    def acquire_write_lock(self):
+        self._waiting_for_write_lock = True
+        try:
+            return self._acquire(fcntl.LOCK_EX)
+        finally:
+            self._waiting_for_write_lock = False
+
+
+class ShelveFile(object):
+    """
+    A shelve file and its lock.
+
+    Readers share the lock, a writer has it to itself until the
+    shelf is closed.
+
+    :param filename: The shelve's filename.
+    :param protocol: Pickle protocol.
+    :param writeback: Writeback option for `shelve.open`.
+    :param lockfile: The lock's filename, defaults to `filename`
+                     with '.lock' appended.
+    :param poll: Seconds between attempts to take the lock (see
+                 `PollingFileLock`), or None to block until it's
+                 free.
+    """
+    def __init__(self, filename, protocol=None, writeback=False,
+                 lockfile=None, poll=None):
+        self.filename = filename
+        self.protocol = protocol
+        self.writeback = writeback
+
+        lockfile = lockfile or filename + '.lock'
+        if poll is None:
+            self._lock = flask_shelve._FileLock(lockfile)
+        else:
+            self._lock = PollingFileLock(lockfile, poll)
+
+        # Create the file so it can always be opened read only.
+        shelve.open(filename, 'c', protocol).close()
+
+    def open(self, flag='c'):
+        """
+        Lock and open the shelve file.
+
+        :param flag: Flag parameter for `shelve.open`.
+
+        :returns: A `LockedShelf`.
+        """
+        if flag in ('c', 'w', 'n'):
+            fileno = self._lock.acquire_write_lock()
+            release = lambda: self._lock.release_write_lock(fileno)
+        else:
+            fileno = self._lock.acquire_read_lock()
+            release = lambda: self._lock.release_read_lock(fileno)
+
+        try:
+            return LockedShelf(self.filename, flag, self.protocol,
+                               self.writeback, release)
+        except:
+            release()
+            raise
+
+
+class ShelveStorage(BaseStorage):
+    """
+    Stores everything in the `SHELVE_FILENAME` shelve file.
+    """
+    def __init__(self, app):
+        super(ShelveStorage, self).__init__(app)
+
+        if 'SHELVE_FILENAME' not in app.config:
+            raise RuntimeError("SHELVE_FILENAME is required in the "
+                               "app configuration.")
+
+        filename = app.config['SHELVE_FILENAME']
+        self.file = ShelveFile(
+            filename,
+            self.protocol,
+            app.config.setdefault('SHELVE_WRITEBACK', False),
+            app.config.setdefault('SHELVE_LOCKFILE', filename + '.lock'),
+            self.poll
+        )
+
+    def open(self, flag='c'):
+        return self.file.open(flag)
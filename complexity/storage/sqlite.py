@@ -0,0 +1,221 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: storage/sqlite.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    SQLite storage backend.
+
+    The database is used in WAL (write-ahead logging) mode so readers
+    never wait for writers, and each operation commits by itself so
+    no lock is held for the rest of the request.
+
+    The 'expires' of stored `dict`s (e.g. quiz states) is kept in its
+    own column so expired values are swept with a single `DELETE`.
+
+"""
+
+import time
+import sqlite3
+from contextlib import contextmanager
+
+from .base import BaseStorage, StorageConnection
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Stores serialized values in the `SQLITE_FILENAME` database.
+    """
+    def __init__(self, app):
+        super(SQLiteStorage, self).__init__(app)
+
+        self.filename = app.config.setdefault('SQLITE_FILENAME',
+                                              'complexity.sqlite')
+        # Seconds to wait for another writer.
+        self.timeout = app.config.setdefault('SQLITE_TIMEOUT', 5.0)
+
+        # Other workers may be starting too, so wait for them.
+        connection = self.connect(self.timeout)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS storage ('
+            '    key TEXT PRIMARY KEY,'
+            '    value BLOB,'
+            '    expires REAL'
+            ')'
+        )
+
+        # Databases from before there was an `expires` column.
+        columns = [
+            row[1] for row in
+            connection.execute('PRAGMA table_info(storage)')
+        ]
+        if 'expires' not in columns:
+            connection.execute(
+                'ALTER TABLE storage ADD COLUMN expires REAL'
+            )
+
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS storage_expires '
+            'ON storage (expires)'
+        )
+        connection.close()
+
+    def connect(self, timeout=None):
+        """
+        :param timeout: Seconds SQLite waits for a lock itself. By
+                        default `SQLITE_TIMEOUT`, or none at all when
+                        polling for locks (see `SQLiteConnection`).
+
+        :returns: A new autocommit connection to the database.
+        """
+        if timeout is None:
+            timeout = self.timeout if self.poll is None else 0
+        return sqlite3.connect(self.filename, timeout=timeout,
+                               isolation_level=None)
+
+    def open(self, flag='c'):
+        return SQLiteConnection(self, flag)
+
+    def sweep(self, prefixes, expired, now):
+        """
+        Remove everything that has expired by its `expires` column at
+        once. Values without one (e.g. from before the column was
+        added) are each checked with `expired`.
+        """
+        matches = ' OR '.join(['substr(key, 1, ?) = ?'] * len(prefixes))
+        parameters = tuple(
+            parameter
+            for prefix in prefixes
+            for parameter in (len(prefix), prefix)
+        )
+
+        connection = SQLiteConnection(self, 'c')
+        try:
+            removed = connection.execute(
+                'DELETE FROM storage WHERE expires <= ? AND '
+                '({})'.format(matches),
+                (now,) + parameters
+            ).rowcount
+
+            checked = removed + connection.execute(
+                'SELECT COUNT(*) FROM storage WHERE {}'.format(matches),
+                parameters
+            ).fetchone()[0]
+
+            keys = [
+                str(key) for key, in connection.execute(
+                    'SELECT key FROM storage WHERE expires IS NULL AND '
+                    '({})'.format(matches),
+                    parameters
+                )
+            ]
+        finally:
+            connection.close()
+
+        return checked, removed + self.sweep_keys(keys, expired, now)
+
+
+class SQLiteConnection(StorageConnection):
+    """
+    Access to a `SQLiteStorage`.
+
+    :param storage: The `SQLiteStorage` instance.
+    """
+    def __init__(self, storage, flag='c'):
+        super(SQLiteConnection, self).__init__(flag)
+        self.storage = storage
+        self.connection = storage.connect()
+
+    def execute(self, sql, parameters=()):
+        """
+        Execute `sql`. When the storage polls for locks (see
+        `STORAGE_LOCK_POLL`), a locked database is tried again every
+        `poll` seconds, sleeping in between, until `SQLITE_TIMEOUT`.
+
+        :returns: The `sqlite3.Cursor`.
+        """
+        poll = self.storage.poll
+        if poll is None:
+            return self.connection.execute(sql, parameters)
+
+        deadline = time.time() + self.storage.timeout
+        while True:
+            try:
+                return self.connection.execute(sql, parameters)
+            except sqlite3.OperationalError as error:
+                if 'locked' not in str(error) or time.time() > deadline:
+                    raise
+            time.sleep(poll)
+
+    def __getitem__(self, key):
+        row = self.execute(
+            'SELECT value FROM storage WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return self.storage.loads(str(row[0]))
+
+    def __setitem__(self, key, value):
+        self.check_writable()
+        expires = value.get('expires') if isinstance(value, dict) else None
+        self.execute(
+            'INSERT OR REPLACE INTO storage (key, value, expires) '
+            'VALUES (?, ?, ?)',
+            (key, sqlite3.Binary(self.storage.dumps(value)), expires)
+        )
+
+    def __delitem__(self, key):
+        self.check_writable()
+        cursor = self.execute(
+            'DELETE FROM storage WHERE key = ?', (key,)
+        )
+
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.execute(
+            'SELECT 1 FROM storage WHERE key = ?', (key,)
+        ).fetchone() is not None
+
+    def keys(self):
+        return [
+            str(key) for key, in
+            self.execute('SELECT key FROM storage')
+        ]
+
+    def get_many(self, keys, default=None):
+        """
+        Read every key with a single `SELECT`, which always sees the
+        database at one point in time.
+        """
+        rows = dict(self.execute(
+            'SELECT key, value FROM storage WHERE key IN ({})'.format(
+                ', '.join(['?'] * len(keys))
+            ),
+            tuple(keys)
+        ))
+
+        return [
+            self.storage.loads(str(rows[key])) if key in rows else default
+            for key in keys
+        ]
+
+    @contextmanager
+    def locked(self, key):
+        self.check_writable()
+
+        # Take the database's write lock until the end of the block.
+        self.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except:
+            self.execute('ROLLBACK')
+            raise
+        self.execute('COMMIT')
+
+    def close(self):
+        self.connection.close()
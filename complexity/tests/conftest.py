@@ -6,8 +6,16 @@
 
 """
 import os
+import sys
+import types
 import pytest
 
+# The real secrets are generated by `fab create_secrets` and never
+# committed, so tests sign cookies with their own.
+secrets = types.ModuleType('complexity.secrets')
+secrets.COOKIE_SECRET = 'test-cookie-secret'
+sys.modules['complexity.secrets'] = secrets
+
 from complexity import create_app
 
 # NOTE: Fixtures are used to setup and clean up an environment for
@@ -0,0 +1,120 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_assets.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import json
+
+import pytest
+
+from complexity import create_app
+
+def test_prebuilt(tmpdir):
+    """
+    Test prebuilt bundles are only looked up in the manifest, never
+    built, and are required to have been built.
+    """
+    manifest = tmpdir.join('assets-manifest.json')
+    config = dict(
+        ASSETS_AUTO_BUILD=False,
+        ASSETS_MANIFEST='json:' + str(manifest),
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin'))
+    )
+
+    with pytest.raises(RuntimeError):
+        create_app(**config)
+
+    manifest.write(json.dumps({
+        'base.%(version)s.js': '0123abcd',
+        'base.%(version)s.css': '4567abcd',
+        'katex.%(version)s.js': '0123cdef',
+        'katex.%(version)s.css': '4567cdef',
+        'quiz-the_modulus.%(version)s.js': '89abcdef',
+    }))
+    app = create_app(**config)
+    assets = app.jinja_env.assets_environment
+
+    with app.test_request_context():
+        assert assets['js_base'].urls() == ['/static/base.0123abcd.js']
+        assert assets['quiz-the_modulus'].urls() == \
+            ['/static/quiz-the_modulus.89abcdef.js']
+
+def test_static(tmpdir):
+    """
+    Test bundles are sent precompressed to clients accepting it, and
+    cached forever.
+    """
+    import gzip
+    import mimetypes
+    from StringIO import StringIO
+
+    from complexity.views.static import precompress, IMMUTABLE_MAX_AGE
+
+    app = create_app(
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin'))
+    )
+    app.static_folder = str(tmpdir)
+
+    script = 'var answer = 42;\n' * 100
+    tmpdir.join('base.0123abcd.js').write(script)
+    tmpdir.join('other.js').write(script)
+    assert precompress(str(tmpdir.join('base.0123abcd.js'))) == \
+        [str(tmpdir.join('base.0123abcd.js.gz'))]
+
+    test_client = app.test_client()
+
+    response = test_client.get(
+        '/static/base.0123abcd.js',
+        headers={'Accept-Encoding': 'gzip, deflate'}
+    )
+    assert response.content_encoding == 'gzip'
+    assert response.mimetype == mimetypes.guess_type('all.js')[0]
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.GzipFile(fileobj=StringIO(response.data)).read() == \
+        script
+    assert response.cache_control.max_age == IMMUTABLE_MAX_AGE
+    assert 'immutable' in response.headers['Cache-Control']
+
+    response = test_client.get('/static/base.0123abcd.js')
+    assert response.content_encoding is None
+    assert response.data == script
+
+    response = test_client.get(
+        '/static/other.js', headers={'Accept-Encoding': 'gzip'}
+    )
+    assert response.content_encoding is None
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+
+def test_page_bundles(tmpdir):
+    """
+    Test KaTeX is only on the quiz pages, loaded by the quiz's script.
+    """
+    manifest = tmpdir.join('assets-manifest.json')
+    manifest.write(json.dumps({
+        'base.%(version)s.js': '0123abcd',
+        'base.%(version)s.css': '4567abcd',
+        'katex.%(version)s.js': '0123cdef',
+        'katex.%(version)s.css': '4567cdef',
+        'quiz-the_modulus.%(version)s.js': '89abcdef',
+    }))
+    app = create_app(
+        ASSETS_AUTO_BUILD=False,
+        ASSETS_MANIFEST='json:' + str(manifest),
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin'))
+    )
+    test_client = app.test_client()
+
+    index = test_client.get('/').data
+    assert '/static/base.0123abcd.js' in index
+    assert '/static/base.4567abcd.css' in index
+    assert 'katex' not in index
+
+    quiz = test_client.get('/quiz/the_modulus').data
+    assert '/static/quiz-the_modulus.89abcdef.js' in quiz
+    # Only loaded by the script, not the page.
+    assert '<script src="/static/katex.0123cdef.js">' not in quiz
+    assert '"/static/katex.0123cdef.js"' in quiz
+    assert '"/static/katex.4567cdef.css"' in quiz
@@ -0,0 +1,55 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_batch.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import pytest
+
+from complexity.batch import new_seeds
+from complexity.seeded import SeededRandom
+from complexity.quizzes.the_modulus import (ModulusProductQuestion,
+                                            ModulusDivisionQuestion)
+
+QUESTION_TYPES = [ModulusProductQuestion, ModulusDivisionQuestion]
+
+def test_seeded_random():
+    """
+    Test seeded numbers are recreated from their seed and samples are
+    all different.
+    """
+    first, second = SeededRandom(5), SeededRandom(5)
+    assert [first.randrange(1, 11) for _ in xrange(10)] ==\
+        [second.randrange(1, 11) for _ in xrange(10)]
+
+    for seed in xrange(100):
+        sample = SeededRandom(seed).sample(range(19), 2)
+        assert len(set(sample)) == 2
+
+@pytest.mark.parametrize('question_type', QUESTION_TYPES)
+def test_batch(question_type):
+    """
+    Test each of a batch's questions is the same as the question
+    with its seed.
+    """
+    pytest.importorskip('numpy')
+
+    seeds = new_seeds(500)
+    batch = question_type.batch_type(question_type, seeds)
+    assert len(batch) == 500
+
+    for index, seed in enumerate(seeds):
+        assert batch.ask(index) == question_type(seed).ask()
+
+@pytest.mark.parametrize('question_type', QUESTION_TYPES)
+def test_many(question_type):
+    """
+    Test questions from `many` are built when more than their
+    rendered question is used.
+    """
+    question = question_type.many(1)[0]
+    built = question_type(question.seed)
+
+    assert question.to_state() == built.to_state()
+    assert question.ask('MathML') == built.ask('MathML')
@@ -6,7 +6,7 @@
 
 """
 
-from complexity.cookie import Cookie
+from complexity.cookie import Cookie, encode_state, decode_state
 
 DATA = 'somedata'
 FAKE_SIGNATURE = 'fake-signature'
@@ -42,3 +42,22 @@ def test_fake_cookie():
     cookie_with_check = Cookie(cookie_str, new=False)
     assert cookie_with_check.data is None
 
+def test_state():
+    """
+    Test encoding and decoding a state.
+    """
+    state = dict(score=15, questions=[[0, 3], [1, 3]], ended=False)
+    data = encode_state(state)
+
+    # The encoded state must not contain the cookie's delimiter.
+    assert '|' not in data
+    assert decode_state(data) == state
+
+    cookie_with_check = Cookie(Cookie(data).value, new=False)
+    assert decode_state(cookie_with_check.data) == state
+
+def test_invalid_state():
+    """
+    Test decoding something that is not a state.
+    """
+    assert decode_state(DATA) is None
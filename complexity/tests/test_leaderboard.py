@@ -0,0 +1,173 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_leaderboard.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import random
+from contextlib import contextmanager
+
+from flask import Flask
+
+from complexity.leaderboard import (Leaderboard, insort_descending,
+                                    pages_cache)
+
+
+class Storage(dict):
+    """
+    A dictionary with the `locked` and `get_many` methods storage
+    connections have.
+    """
+    @contextmanager
+    def locked(self, key):
+        yield
+
+    def get_many(self, keys, default=None):
+        return [self.get(key, default) for key in keys]
+
+def test_insort_descending():
+    """
+    Test items are kept in descending order.
+    """
+    items = []
+    for _ in xrange(100):
+        insort_descending(items, random.randrange(20))
+    assert items == sorted(items, reverse=True)
+
+def test_top():
+    """
+    Test only the best records are kept in order and every record is
+    archived.
+    """
+    storage = Storage()
+    leaderboard = Leaderboard(storage, 'the_modulus', limit=10)
+
+    records = [(random.randrange(100), str(i)) for i in xrange(50)]
+    for record in records:
+        leaderboard.add(record)
+
+    assert leaderboard.top() == sorted(records, reverse=True)[:10]
+    assert len(leaderboard) == 50
+    assert [leaderboard.archived(i) for i in xrange(50)] == records
+
+def test_position():
+    """
+    Test the position a record was added at is returned.
+    """
+    leaderboard = Leaderboard(Storage(), 'the_modulus', limit=2)
+
+    assert leaderboard.add((10, 'Jack')) == 0
+    assert leaderboard.add((20, 'Emma')) == 0
+    assert leaderboard.add((15, 'Tom')) == 1
+    assert leaderboard.add((5, 'Harry')) is None
+
+def test_old_records():
+    """
+    Test records from before the archive existed are kept.
+    """
+    records = [(30, 'Jack'), (20, 'Emma'), (10, 'Tom')]
+    storage = Storage(the_modulus=list(records))
+    leaderboard = Leaderboard(storage, 'the_modulus', limit=2)
+
+    leaderboard.add((25, 'Harry'))
+
+    assert leaderboard.top() == [(30, 'Jack'), (25, 'Harry')]
+    assert len(leaderboard) == 4
+    assert leaderboard.archived(3) == (25, 'Harry')
+
+def test_page():
+    """
+    Test the best records are split into pages and the time they
+    last changed is kept.
+    """
+    leaderboard = Leaderboard(Storage(), 'the_modulus', limit=3)
+    assert leaderboard.updated is None
+
+    for record in [(30, 'Jack'), (20, 'Emma'), (10, 'Tom'), (5, 'Harry')]:
+        leaderboard.add(record)
+    updated = leaderboard.updated
+
+    assert leaderboard.page(1, 2) == [(30, 'Jack'), (20, 'Emma')]
+    assert leaderboard.page(2, 2) == [(10, 'Tom')]
+    assert leaderboard.page(3, 2) == []
+
+    # Not one of the best, so nothing changed.
+    leaderboard.add((1, 'Hannah'))
+    assert leaderboard.updated == updated
+
+    top, snapshot_updated = leaderboard.snapshot()
+    assert top == leaderboard.top()
+    assert snapshot_updated == updated
+    assert leaderboard.page(2, 2, top) == [(10, 'Tom')]
+    assert Leaderboard(Storage(), 'the_modulus').snapshot() == ([], None)
+
+def test_rank():
+    """
+    Test scores are ranked against every record, not only the best.
+    """
+    storage = Storage()
+    leaderboard = Leaderboard(storage, 'the_modulus', limit=2)
+
+    scores = [random.randrange(200) for _ in xrange(50)]
+    for i, score in enumerate(scores):
+        leaderboard.add((score, str(i)))
+
+    for score in xrange(-1, 201):
+        rank = leaderboard.rank(score)
+        assert rank['rank'] == 1 + sum(s > score for s in scores)
+        assert rank['percentile'] == \
+            100.0 * sum(s < score for s in scores) / len(scores)
+        assert rank['total'] == 50
+
+def test_rank_old_records():
+    """
+    Test records from before scores were ranked get ranked.
+    """
+    storage = Storage(the_modulus=[(30, 'Jack'), (20, 'Emma')])
+    leaderboard = Leaderboard(storage, 'the_modulus')
+
+    leaderboard.add((25, 'Tom'))
+
+    assert leaderboard.rank(25)['rank'] == 2
+    assert leaderboard.rank(10)['rank'] == 4
+    assert leaderboard.rank(10)['total'] == 3
+
+def test_rank_unindexed():
+    """
+    Test records archived before scores were ranked get ranked without
+    a record being added first.
+    """
+    storage = Storage(the_modulus=[(30, 'Jack'), (20, 'Emma')])
+    leaderboard = Leaderboard(storage, 'the_modulus')
+    assert leaderboard.unindexed()
+
+    assert leaderboard.rank(25) == dict(rank=2, percentile=50.0, total=2)
+    assert not leaderboard.unindexed()
+
+    # Archived, but not yet ranked.
+    storage['the_modulus-2'] = (10, 'Tom')
+    storage['the_modulus-count'] = 3
+    assert leaderboard.unindexed()
+    assert leaderboard.rank(10)['total'] == 3
+
+def test_invalidate_cache():
+    """
+    Test a quiz's cached pages are removed when its best records
+    change.
+    """
+    storage = Storage()
+    leaderboard = Leaderboard(storage, 'the_modulus', limit=1)
+
+    with Flask(__name__).app_context():
+        cache = pages_cache()
+        leaderboard.add((10, 'Jack'))
+
+        cache.update({('the_modulus', 1): None, ('other', 1): None})
+        # Not one of the best records, so the pages are the same.
+        leaderboard.add((5, 'Emma'))
+        assert len(cache) == 2
+
+        leaderboard.add((15, 'Tom'))
+        assert cache.keys() == [('other', 1)]
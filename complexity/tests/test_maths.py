@@ -166,6 +166,21 @@ def test_complex_number(a=None, b=None):
 
     assert z.render() == '{} + {}j'.format(a, b)
 
+def test_complex_random_number():
+    """
+    Test a complex number with random constants renders their new
+    values once they're reset.
+    """
+    a = MathsRandomConstant(1, 10)
+    b = MathsRandomConstant(1, 10)
+    z = MathsComplexNumber(a, b)
+    assert z.render() == '{} + {}j'.format(a.evaluate(), b.evaluate())
+
+    a.reset()
+    b.reset()
+    a._render, b._render = 10, 11
+    assert z.render() == '10 + 11j'
+
 def test_compute_modulus(a=None, b=None):
     """
     Test the compute_modulus function.
@@ -219,3 +234,133 @@ def test_compute_divide():
     
 
 
+
+def test_render_cache():
+    """
+    Test renders are reused until a random constant is reset.
+    """
+    calls = []
+
+    @MathsOperator.new(BODMAS.brackets)
+    def count(operand, **kwargs):
+        calls.append(operand)
+        return MathsOperand(operand.render(**kwargs), BODMAS.brackets)
+
+    a = MathsRandomConstant(0, 1000)
+    expression = MathsExpression(
+        MathsExpression(a, count), operators.sqrt
+    )
+
+    rendered = expression.render()
+    assert expression.render() == rendered
+    assert len(calls) == 1
+
+    a.reset()
+    a._render = 1000
+    assert expression.render() == '\\sqrt{ 1000 }'
+    assert len(calls) == 2
+
+def test_evaluate():
+    """
+    Test expressions are evaluated without rendering.
+    """
+    from fractions import Fraction
+
+    a = MathsConstant(3)
+    b = MathsConstant(4)
+    x = MathsVariable('x')
+
+    assert MathsExpression([a, b], operators.add).evaluate() == 7
+    assert MathsExpression([a, b], operators.subtract).evaluate() == -1
+    assert MathsExpression([a, x]).evaluate(variables=dict(x=2)) == 6
+    assert MathsExpression([a, b], operators.divide).evaluate() == \
+        Fraction(3, 4)
+    assert MathsExpression(
+        MathsConstant(25), operators.sqrt
+    ).evaluate() == 5
+
+    z = MathsComplexNumber(a, b)
+    assert z.evaluate() == 3 + 4j
+    assert MathsExpression(z, operators.abs).evaluate() == 5
+    assert compute_product(z, z).evaluate() == (3 + 4j) ** 2
+
+def test_compile():
+    """
+    Test compiled expressions render the same as the expression.
+    """
+    a = MathsRandomConstant(1, 100)
+    b = MathsRandomConstant(1, 100)
+    expression = MathsExpression([
+        MathsExpression([a, MathsVariable('x')], operators.divide),
+        MathsExpression(b, operators.sqrt)
+    ], operators.add)
+
+    plan = expression.compile()
+    assert plan.slots == [a, b]
+    assert plan.render() == expression.render()
+    assert plan.format(3, 4) == '\\frac{ 3 }{ x } + \\sqrt{ 4 }'
+
+def test_formats():
+    """
+    Test expressions render in every format.
+    """
+    z = MathsComplexNumber(MathsConstant(3), MathsConstant(4))
+    expression = MathsExpression(
+        MathsExpression([z, MathsVariable('w')], operators.divide),
+        operators.abs
+    )
+
+    assert expression.render(format_='MathML') == (
+        '<mrow><mo>|</mo><mfrac><mrow><mrow><mn>3</mn><mo>+</mo>'
+        '<mrow><mn>4</mn><mi>j</mi></mrow></mrow></mrow>'
+        '<mrow><mi>w</mi></mrow></mfrac><mo>|</mo></mrow>'
+    )
+    assert expression.render(format_='text') == '|(3 + 4j) / w|'
+    assert expression.render() == \
+        '\\left|\\frac{ 3 + 4j }{ w } \\right|'
+
+def test_pickle():
+    """
+    Test expressions are the same once pickled and loaded.
+    """
+    import cPickle
+
+    a = MathsRandomConstant(1, 100)
+    z = MathsComplexNumber(a, MathsConstant(4))
+    expression = MathsExpression([
+        MathsExpression(z, operators.abs),
+        MathsExpression(MathsVariable('w'), operators.sqrt)
+    ], operators.divide)
+
+    for protocol in xrange(3):
+        copy = cPickle.loads(cPickle.dumps(expression, protocol))
+        assert copy.render() == expression.render()
+        assert copy.evaluate(variables=dict(w=4)) == \
+            expression.evaluate(variables=dict(w=4))
+
+def test_shared():
+    """
+    Test identical shared operands are the same object.
+    """
+    z = shared_variable('z')
+    assert z is shared_variable('z')
+    assert shared_constant(4) is shared_constant(4)
+    # Equal values of different types render differently.
+    assert shared_constant(4) is not shared_constant(4.0)
+
+    z_mod = shared_expression(z, operators.abs)
+    assert z_mod is shared_expression([shared_variable('z')],
+                                      operators.abs)
+    assert z_mod is not shared_expression(z, operators.sqrt)
+    assert z_mod.render() == '\\left|z \\right|'
+
+    assert compute_modulus(MathsComplexNumber(
+        MathsConstant(3), MathsConstant(4)
+    )) is shared_expression(shared_constant(25), operators.sqrt)
+
+    try:
+        shared_expression(MathsRandomConstant(1, 10), operators.abs)
+    except ValueError:
+        pass
+    else:
+        assert False, "Random constants can't be shared."
@@ -0,0 +1,106 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_quizzes.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import time
+import cPickle
+
+import pytest
+from flask import Flask
+
+from complexity.quizzes import QuestionPool, new_question
+from complexity.quizzes.the_modulus import (Quiz, ModulusProductQuestion,
+                                            ModulusDivisionQuestion)
+
+app = Flask(__name__)
+
+def test_question_state():
+    """
+    Test questions are the same once recreated from their state.
+    """
+    for Question in [ModulusProductQuestion, ModulusDivisionQuestion]:
+        question = Question()
+        state = question.to_state()
+        copy = Question.from_state(cPickle.loads(cPickle.dumps(state)))
+
+        assert copy.ask() == question.ask()
+        assert copy.to_state() == state
+
+def test_quiz_state():
+    """
+    Test a quiz is the same once recreated from its state.
+    """
+    quiz = Quiz()
+    with app.test_request_context(method='GET'):
+        asked = quiz.next()
+
+    state = quiz.to_state()
+    copy = Quiz.from_state(cPickle.loads(cPickle.dumps(state)))
+
+    with app.test_request_context(method='GET'):
+        assert copy.next() == asked
+    assert copy.to_state() == state
+
+def test_question_seed():
+    """
+    Test the same seed recreates the same question.
+    """
+    for Question in [ModulusProductQuestion, ModulusDivisionQuestion]:
+        for seed in xrange(50):
+            question = Question(seed)
+            assert Question(question.seed).ask() == question.ask()
+
+def test_question_pool():
+    """
+    Test the pool is refilled and recent questions are recreated
+    without being changed by answering them.
+    """
+    pool = QuestionPool(ModulusProductQuestion, size=4)
+    pool.get()
+
+    for _ in xrange(100):
+        if len(pool) == 4:
+            break
+        time.sleep(0.05)
+    assert len(pool) == 4
+
+    question = new_question(ModulusProductQuestion)
+    state = question.to_state()
+    question.answer(dict(answer=[[0, 0]] * 3))
+
+    copy = ModulusProductQuestion.from_state(state)
+    assert copy.to_state() == state
+    assert copy.ask() == question.ask()
+
+def test_question_pool_green(monkeypatch):
+    """
+    Test the pool is refilled by gevent's threadpool, not a green
+    thread, when threads are green.
+    """
+    pytest.importorskip('gevent')
+
+    from complexity import quizzes
+    monkeypatch.setattr(quizzes, 'green_threads', lambda: True)
+
+    pool = QuestionPool(ModulusProductQuestion, size=4)
+    pool.get()
+    pool._filling.get(timeout=10)
+
+    assert len(pool) == 4
+    assert pool._thread is None
+
+def test_wrong_answers():
+    """
+    Test every part's answers are different, without retrying seeds.
+    """
+    for Question in [ModulusProductQuestion, ModulusDivisionQuestion]:
+        for seed in xrange(500):
+            question = Question(seed)
+            assert question.seed == seed
+
+            for _, answers, _ in question.question:
+                assert len(set(answers)) == 3
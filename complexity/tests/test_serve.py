@@ -0,0 +1,80 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_serve.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import urllib2
+import threading
+
+import pytest
+
+from complexity import create_app
+from complexity import serve
+from complexity.serve import check_workers, fallback_server
+
+def hello(environ, start_response):
+    """
+    A WSGI application to serve.
+    """
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return ['Hello']
+
+def test_check_workers(tmpdir):
+    """
+    Test only storage shared between processes can be used by more
+    than one worker.
+    """
+    for backend in ['shelve', 'sharded', 'sqlite']:
+        app = create_app(
+            STORAGE_BACKEND=backend,
+            SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin')),
+            SQLITE_FILENAME=str(tmpdir.join('test_complexity.sqlite'))
+        )
+        check_workers(app, 4)
+
+    app = create_app(STORAGE_BACKEND='memory')
+    check_workers(app, 1)
+    with pytest.raises(RuntimeError):
+        check_workers(app, 2)
+
+def test_fallback():
+    """
+    Test the server used without Gunicorn serves requests.
+    """
+    server = fallback_server(lambda: hello, '127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    try:
+        url = 'http://127.0.0.1:{}/'.format(server.server_port)
+        assert urllib2.urlopen(url, timeout=10).read() == 'Hello'
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+def test_async_needs_gunicorn(monkeypatch):
+    """
+    Test serving asynchronously is refused without Gunicorn.
+    """
+    monkeypatch.setattr(serve, 'BaseApplication', None)
+    with pytest.raises(RuntimeError):
+        serve.serve(lambda: hello, async_=True)
+
+def test_gunicorn_options():
+    """
+    Test Gunicorn is given the worker class for the options.
+    """
+    pytest.importorskip('gunicorn')
+
+    def options(threads, async_):
+        server = serve.GunicornServer(lambda: hello, '127.0.0.1', 0, 2,
+                                      threads, True, 30, async_, 10)
+        return server.cfg
+
+    assert options(4, False).worker_class_str == 'gthread'
+    assert options(1, False).worker_class_str == 'sync'
+    assert options(1, True).worker_class_str == 'gevent'
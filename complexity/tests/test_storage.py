@@ -0,0 +1,205 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: tests/test_storage.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import pytest
+
+from complexity import create_app
+from complexity.storage import open_storage
+from complexity.quizzes import SHELVE_INSTANCE_PREFIX, sweep_instances
+from complexity.quizzes.the_modulus import Quiz as TheModulus
+
+from views.quizzes import Quiz
+
+BACKENDS = ['shelve', 'sharded', 'sqlite', 'memory']
+
+quiz = Quiz("the_modulus")
+
+@pytest.fixture(params=BACKENDS)
+def backend_app(request, tmpdir):
+    """
+    Setup Flask app instance for each storage backend.
+
+    :param request: Fixture request object passed by pytest.
+    :param tmpdir: Builtin fixture for a temporary directory.
+    """
+    return create_app(
+        STORAGE_BACKEND=request.param,
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin')),
+        SQLITE_FILENAME=str(tmpdir.join('test_complexity.sqlite'))
+    )
+
+def test_read_write(backend_app):
+    """
+    Test values can be stored, read and removed.
+    """
+    with backend_app.test_request_context():
+        storage = open_storage('c')
+        storage['key'] = [(15, 'Jack')]
+        storage.close()
+
+        storage = open_storage('r')
+        assert 'key' in storage
+        assert storage['key'] == [(15, 'Jack')]
+        assert storage.get('missing', []) == []
+        storage.close()
+
+        storage = open_storage('c')
+        del storage['key']
+        assert 'key' not in storage
+        storage.close()
+
+def test_get_many(backend_app):
+    """
+    Test several values are read together, in order, across shards.
+    """
+    with backend_app.test_request_context():
+        storage = open_storage('c')
+        storage['key'] = 1
+        storage[SHELVE_INSTANCE_PREFIX + 'key'] = 2
+        storage.close()
+
+        storage = open_storage('r')
+        assert storage.get_many(
+            [SHELVE_INSTANCE_PREFIX + 'key', 'missing', 'key'], 0
+        ) == [2, 0, 1]
+        storage.close()
+
+def test_copies(backend_app):
+    """
+    Test that changing a loaded value does not change the stored one.
+    """
+    with backend_app.test_request_context():
+        storage = open_storage('c')
+        storage['key'] = []
+        storage['key'].append(1)
+        assert storage['key'] == []
+        storage.close()
+
+def test_unknown_backend(tmpdir):
+    """
+    Test an unknown backend is refused.
+    """
+    with pytest.raises(RuntimeError):
+        create_app(STORAGE_BACKEND='unknown')
+
+def test_quiz(backend_app):
+    """
+    Test a quiz can be taken with each backend.
+    """
+    test_client = backend_app.test_client()
+    quiz.new(test_client)
+
+    score = quiz.answer_correct(test_client, *([3]*3))['score']
+    assert score == 5*3
+
+def test_shards(tmpdir):
+    """
+    Test quiz instances are spread across the shards and the records
+    are kept on their own.
+    """
+    app = create_app(
+        STORAGE_BACKEND='sharded',
+        SHELVE_SHARDS=4,
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin'))
+    )
+    storage = app.extensions['storage']
+
+    shards = set(
+        storage.shard('quiz-{}'.format(i)) for i in xrange(100)
+    )
+    assert shards == set(storage.shards)
+    assert storage.shard('the_modulus') is storage.records
+
+def test_locked(backend_app):
+    """
+    Test values can be changed while locked.
+    """
+    with backend_app.test_request_context():
+        storage = open_storage('c')
+        storage['the_modulus'] = 1
+
+        with storage.locked('the_modulus'):
+            storage['the_modulus'] += 1
+        assert storage['the_modulus'] == 2
+
+        storage.close()
+
+def test_sweep(backend_app):
+    """
+    Test only expired (or invalid) instances are swept.
+    """
+    with backend_app.test_request_context():
+        storage = open_storage('c')
+        storage['the_modulus'] = [(15, 'Jack')]
+
+        for i, ttl in enumerate([None, 60, -60]):
+            instance = TheModulus()
+            instance._id = str(i)
+            instance.save(storage, ttl)
+
+        # An instance from an older version.
+        storage[SHELVE_INSTANCE_PREFIX + 'old'] = dict(version=0)
+        storage.close()
+
+        assert sweep_instances(backend_app.extensions['storage']) ==\
+            (4, 2)
+
+        storage = open_storage('r')
+        assert sorted(storage.keys()) == [
+            SHELVE_INSTANCE_PREFIX + '0',
+            SHELVE_INSTANCE_PREFIX + '1',
+            'the_modulus'
+        ]
+        assert TheModulus.get_instance(storage, '1').score == 0
+        storage.close()
+
+@pytest.mark.parametrize('backend', ['shelve', 'sqlite'])
+def test_lock_poll(backend, tmpdir):
+    """
+    Test waiting for a lock sleeps (letting async workers switch to
+    other requests) when `STORAGE_LOCK_POLL` is set.
+    """
+    import time
+    import threading
+
+    app = create_app(
+        STORAGE_BACKEND=backend,
+        STORAGE_LOCK_POLL=0.01,
+        SHELVE_FILENAME=str(tmpdir.join('test_complexity.bin')),
+        SQLITE_FILENAME=str(tmpdir.join('test_complexity.sqlite'))
+    )
+    sleeps = []
+    sleep = time.sleep
+
+    def write():
+        with app.test_request_context():
+            storage = open_storage('c')
+            storage['key'] = 'waited'
+            storage.close()
+
+    with app.test_request_context():
+        storage = open_storage('c')
+        with storage.locked('key'):
+            storage['key'] = 'held'
+
+            time.sleep = lambda seconds: sleeps.append(seconds) or \
+                sleep(seconds)
+            try:
+                thread = threading.Thread(target=write)
+                thread.start()
+                sleep(0.1)
+            finally:
+                time.sleep = sleep
+        storage.close()
+
+        thread.join()
+        storage = open_storage('r')
+        assert storage['key'] == 'waited'
+        storage.close()
+
+    assert 0.01 in sleeps
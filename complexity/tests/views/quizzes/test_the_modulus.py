@@ -7,6 +7,11 @@
 """
 
 import json
+import time
+
+from complexity.leaderboard import Leaderboard
+from complexity.quizzes import (SHELVE_INSTANCE_PREFIX,
+                                SHELVE_FINISHED_PREFIX)
 
 from . import Quiz
 
@@ -148,3 +153,167 @@ def test_extreme_answers(test_client):
     resp = quiz.next(test_client, dict(answer=answer))
     assert resp.status == '200 OK'
 
+
+def test_repeated_get(test_client):
+    """
+    Test that requesting the question again (which only reads the
+    quiz) returns the same question.
+    """
+    # Create a new quiz instance.
+    quiz.new(test_client)
+
+    first = json.loads(quiz.next(test_client).data)
+    second = json.loads(quiz.next(test_client).data)
+    assert first == second
+
+def test_state_cookie(app):
+    """
+    Test a quiz stored in the cookie rather than the storage.
+    """
+    app.config['QUIZ_STATE_COOKIE'] = True
+    test_client = app.test_client()
+
+    # Create a new quiz instance.
+    quiz.new(test_client)
+
+    # Answer first two correct.
+    quiz.answer_correct(test_client, *([3]*3))
+    resp = quiz.answer_correct(test_client, *([1]*3))
+    assert resp['score'] == 5*3*2
+    assert resp['spotted']
+
+    # Nothing should have been stored.
+    with app.test_request_context():
+        assert app.extensions['storage'].open('r').keys() == []
+
+def test_finish_once(app):
+    """
+    Test an ended quiz's cookie can't be sent again to add another
+    record, with the quiz stored in the cookie or the storage.
+    """
+    for state_cookie in [True, False]:
+        app.config['QUIZ_STATE_COOKIE'] = state_cookie
+        test_client = app.test_client()
+
+        quiz.new(test_client)
+        for response_time in [1, 2, 3] * 2:
+            quiz.answer_correct(test_client, *([response_time]*3))
+        quiz.next(test_client)
+
+        ended = [
+            c.value for c in test_client.cookie_jar if c.name == 'quiz'
+        ]
+        assert quiz.finish(test_client, 'Jack').status_code == 302
+
+        test_client.set_cookie('localhost', 'quiz', ended[0])
+        assert quiz.finish(test_client, 'Jack').status_code == 400
+
+    with app.test_request_context():
+        storage = app.extensions['storage'].open('r')
+        assert len(Leaderboard(storage, 'the_modulus')) == 2
+
+        # Only the quiz stored in the cookie needed its finish
+        # recorded, to expire with it.
+        finished = [
+            storage[key] for key in storage.keys()
+            if key.startswith(SHELVE_FINISHED_PREFIX)
+        ]
+        assert len(finished) == 1
+        assert finished[0]['expires'] > time.time()
+
+def test_finish_no_ttl(app):
+    """
+    Test the record of a finished quiz expires even when the quiz
+    never does.
+    """
+    app.config['QUIZ_STATE_COOKIE'] = True
+    app.config['QUIZ_INSTANCE_TTL'] = None
+    test_client = app.test_client()
+
+    quiz.new(test_client)
+    for response_time in [1, 2, 3] * 2:
+        quiz.answer_correct(test_client, *([response_time]*3))
+    quiz.next(test_client)
+    quiz.finish(test_client, 'Jack')
+
+    with app.test_request_context():
+        storage = app.extensions['storage'].open('r')
+        finished = [
+            storage[key] for key in storage.keys()
+            if key.startswith(SHELVE_FINISHED_PREFIX)
+        ]
+        assert finished[0]['expires'] is not None
+
+def test_next_once(test_client, monkeypatch):
+    """
+    Test getting a new question only creates it once, even though the
+    quiz is saved again holding its lock.
+    """
+    from complexity.quizzes import the_modulus
+
+    created = []
+    new_question = the_modulus.new_question
+
+    def counted(question_type):
+        created.append(question_type)
+        return new_question(question_type)
+
+    monkeypatch.setattr(the_modulus, 'new_question', counted)
+
+    quiz.new(test_client)
+    asked = json.loads(quiz.next(test_client).data)
+    assert len(created) == 1
+
+    # The question that was saved is the one that was asked.
+    assert json.loads(quiz.next(test_client).data) == asked
+    assert len(created) == 1
+
+def test_format(test_client):
+    """
+    Test the question can be rendered in other formats, with the
+    answers in the same order.
+    """
+    quiz.new(test_client)
+
+    latex = json.loads(quiz.next(test_client).data)
+    url = '/quiz/the_modulus/_next?format={}'
+    mathml = json.loads(test_client.get(url.format('MathML')).data)
+
+    assert mathml['data']['z'].startswith('<mrow><mn>')
+    for part, mathml_part in zip(latex['question'], mathml['question']):
+        assert part[2] == mathml_part[2]
+
+    assert test_client.get(url.format('Word')).status_code == 400
+
+def test_read_extends(app):
+    """
+    Test only reading a quiz extends it once over half its
+    `QUIZ_INSTANCE_TTL` has gone.
+    """
+    app.config['QUIZ_INSTANCE_TTL'] = 100
+    test_client = app.test_client()
+
+    key = SHELVE_INSTANCE_PREFIX + str(json.loads(
+        quiz.new(test_client).data
+    )['ID'])
+    quiz.next(test_client)
+
+    def expires(change=None):
+        with app.test_request_context():
+            storage = app.extensions['storage'].open('c')
+            state = storage[key]
+            if change is not None:
+                state['expires'] = change
+                storage[key] = state
+            storage.close()
+            return state['expires']
+
+    # Under half gone, it's only read.
+    soon = expires(time.time() + 60)
+    quiz.next(test_client)
+    assert expires() == soon
+
+    # Over half gone.
+    expires(time.time() + 40)
+    quiz.next(test_client)
+    assert expires() > time.time() + 90
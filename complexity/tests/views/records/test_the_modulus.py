@@ -6,6 +6,8 @@
 
 """
 
+import json
+
 from ..quizzes import Quiz
 
 quiz = Quiz("the_modulus")
@@ -93,3 +95,56 @@ def test_order(test_client):
         assert next != -1
         last += next
 
+
+def test_not_modified(test_client):
+    """
+    Test the records page is only sent again once it changes.
+    """
+    resp = test_client.get(records_url)
+    etag = resp.headers['ETag']
+
+    resp = test_client.get(records_url, headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+
+    quiz.new(test_client)
+    for _ in xrange(6):
+        quiz.answer_correct(test_client, *([1]*3))
+    quiz.finish(test_client, NAMES[0])
+
+    resp = test_client.get(records_url, headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert NAMES[0] in resp.data
+
+def test_pages(app, test_client):
+    """
+    Test records are split into pages.
+    """
+    app.config['RECORDS_PER_PAGE'] = 1
+
+    for name in NAMES[:2]:
+        quiz.new(test_client)
+        for _ in xrange(6):
+            quiz.answer_correct(test_client, *([1]*3))
+        quiz.finish(test_client, name)
+
+    first = test_client.get(records_url).data
+    second = test_client.get(records_url + "?page=2").data
+
+    assert (NAMES[0] in first) != (NAMES[0] in second)
+    assert (NAMES[1] in first) != (NAMES[1] in second)
+    assert test_client.get(records_url + "?page=3").status_code == 404
+
+def test_rank(test_client):
+    """
+    Test a score can be ranked.
+    """
+    resp = test_client.get(records_url + "/_rank")
+    assert resp.status_code == 400
+
+    quiz.new(test_client)
+    for _ in xrange(6):
+        quiz.answer_correct(test_client, *([1]*3))
+    quiz.finish(test_client, NAMES[0])
+
+    resp = test_client.get(records_url + "/_rank?score=0")
+    assert json.loads(resp.data) == dict(rank=2, percentile=0, total=1)
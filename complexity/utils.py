@@ -9,23 +9,38 @@
 """
 
 from flask import g
-from custom import shelve
+from storage import open_storage
 
 
 def get_shelve(flag="c"):
     """
-    Get shelve and cache for the request.
+    Get the storage (whichever backend is configured) and cache it
+    for the request.
 
-    :param flag: Flag parmeter for `shelve.get_shelve`.
+    Endpoints that only read should use the 'r' flag, so they share
+    the lock with other readers instead of waiting for writers.
+
+    :param flag: Flag parmeter for `storage.open_storage`.
     """
     if hasattr(g, 'shelve'):
         f, s = g.shelve
-        if flag == f:
+        # Storage open for writing can be read from too.
+        if flag == f or flag == 'r':
             return s
+        # Close (releasing the lock) before opening again.
         s.close()
 
-    s = shelve.get_shelve(flag)
+    s = open_storage(flag)
     g.shelve = (flag, s)
 
     return s
 
+def close_shelve(exception=None):
+    """
+    Close the storage opened for the request, if any.
+
+    :param exception: Passed by `flask.Flask.teardown_request`.
+    """
+    if hasattr(g, 'shelve'):
+        g.shelve[1].close()
+        del g.shelve
@@ -10,6 +10,7 @@
 from .root import root_bp
 from .quiz import quiz_bp
 from .records import records_bp
+from .static import send_static
 
 def register_blueprints(app):
     """
@@ -21,3 +22,6 @@ def register_blueprints(app):
     app.register_blueprint(quiz_bp, url_prefix="/quiz")
     app.register_blueprint(records_bp, url_prefix="/records")
 
+    # Send bundles with long lived caching and precompressed.
+    app.view_functions['static'] = send_static
+
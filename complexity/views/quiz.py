@@ -7,17 +7,21 @@
     The quiz blueprint and view functions.
 
 """
+import time
 from functools import wraps
-import bisect
+from contextlib import contextmanager
 
 from flask import (Blueprint, render_template, request, redirect,
                    url_for, abort, g, make_response, jsonify,
                    Response, current_app)
 
-from ..cookie import Cookie
+from ..cookie import Cookie, encode_state, decode_state
 from ..utils import get_shelve
-from ..quizzes import quizzes, quizzes_rev, load_quiz, BaseQuiz
+from ..quizzes import (quizzes, quizzes_rev, load_quiz, BaseQuiz,
+                       SHELVE_INSTANCE_PREFIX)
 from ..errors import BadRequestError
+from ..leaderboard import Leaderboard
+from ..maths import DEFAULT_FORMAT, FORMATS
 
 COOKIE_QUIZ = 'quiz'
 
@@ -27,13 +31,112 @@ quiz_bp = Blueprint(
 )
 
 
+def state_cookie():
+    """
+    :returns: True if quiz instances are stored in the cookie itself
+              (see `QUIZ_STATE_COOKIE`) rather than the storage.
+    """
+    return current_app.config.get('QUIZ_STATE_COOKIE', False)
+
+
+def load_instance(quiz_module, flag='c'):
+    """
+    Load the quiz instance for the request's cookie.
+
+    :param quiz_module: The name of the module in the `quizzes`
+                        package where the `Quiz` class exists.
+    :param flag: The flag to open the storage with.
+
+    :returns: The Quiz instance.
+
+    :raises BadRequestError: When there is no (valid) quiz cookie.
+    """
+    quiz_id = Cookie(request.cookies.get(COOKIE_QUIZ), False).data
+    if quiz_id is None:
+        raise BadRequestError("No Quiz ID!")
+
+    Quiz = load_quiz(quiz_module)
+
+    if not state_cookie():
+        return Quiz.get_instance(get_shelve(flag), quiz_id)
+
+    quiz = Quiz.load_state(decode_state(quiz_id))
+    if quiz is None:
+        raise BadRequestError("Invalid quiz state!")
+
+    quiz._id = quiz_id
+    return quiz
+
+
+@contextmanager
+def instance_locked():
+    """
+    Keep other requests from changing the request's quiz instance
+    while it's loaded, changed and saved inside the `with` block, so
+    none of their changes are lost.
+
+    Instances stored in the cookie (see `QUIZ_STATE_COOKIE`) aren't
+    shared, so there is nothing to lock.
+    """
+    quiz_id = Cookie(request.cookies.get(COOKIE_QUIZ), False).data
+    if quiz_id is None or state_cookie():
+        yield
+        return
+
+    with get_shelve('c').locked(SHELVE_INSTANCE_PREFIX + quiz_id):
+        yield
+
+
+def save_instance(quiz):
+    """
+    Save the quiz instance and set `g.quiz_id` so that the cookie is
+    updated.
+
+    :param quiz: The Quiz instance.
+    """
+    ttl = current_app.config.get('QUIZ_INSTANCE_TTL')
+
+    if state_cookie():
+        g.quiz_id = encode_state(quiz.dump_state(ttl))
+    else:
+        g.quiz_id = quiz.save(get_shelve(), ttl)
+
+
+def expiring(quiz):
+    """
+    Check if a quiz instance should be saved again, to extend it,
+    even though it hasn't changed. That's once over half its
+    `QUIZ_INSTANCE_TTL` has gone, so a player who is only reading
+    isn't swept mid quiz but it's not written on every read.
+
+    :param quiz: The Quiz instance.
+
+    :returns: True if it should be saved.
+    """
+    ttl = current_app.config.get('QUIZ_INSTANCE_TTL')
+    if ttl is None or quiz.expires is None:
+        return False
+
+    return quiz.expires - time.time() < ttl / 2.0
+
+
 def quiz_cookie_manage(response):
     """
     Manage cookie quiz instances based on `g.quiz_id`.
 
+    When `QUIZ_STATE_COOKIE` is set the cookie holds the instance's
+    encoded state instead of its ID, so there is nothing to remove
+    from the storage.
+
     :param response: The response object.
     """
     quiz_req = Cookie(request.cookies.get(COOKIE_QUIZ), False).data
+    if state_cookie():
+        remove_instance = lambda id_: None
+    else:
+        remove_instance = lambda id_: BaseQuiz.remove_instance(
+            get_shelve('c'), id_
+        )
 
     quiz_resp = None
     if hasattr(g, 'quiz_id'):
@@ -47,7 +150,7 @@ def quiz_cookie_manage(response):
         
         # The instance did not get renewed.
         try:
-            BaseQuiz.remove_instance(get_shelve('c'), quiz_req)
+            remove_instance(quiz_req)
         except KeyError:
             pass
         return response.set_cookie(COOKIE_QUIZ, '', expires=0)
@@ -58,7 +161,7 @@ def quiz_cookie_manage(response):
         if quiz_req is not None:
             # Old instance has been replaced.
             try:
-                BaseQuiz.remove_instance(get_shelve('c'), quiz_req)
+                remove_instance(quiz_req)
             except KeyError:
                 pass
 
@@ -144,6 +247,13 @@ def attempt(quiz_module):
             if rule.endpoint.startswith('quiz._')
     }
 
+    # KaTeX is only loaded by the quiz's script, once the page has.
+    assets = current_app.jinja_env.assets_environment
+    template_vars['KATEX_URLS'] = {
+        'js': assets['js_katex'].urls(),
+        'css': assets['css_katex'].urls()
+    }
+
     return render_template("%s.html" % quiz_module, **template_vars)
 
 # NOTE: Endpoints used by client side scripts begin with a '_'
@@ -158,7 +268,8 @@ def _new(quiz_module):
     :param quiz_module: The name of the module in the `quizzes`
                         package where the `Quiz` class exists.
 
-    :returns: The Quiz instance's ID.
+    :returns: The Quiz instance's ID (None if `QUIZ_STATE_COOKIE`
+              is set).
 
     :raises abort(404): The requested `quiz_module` does not exist.
     """
@@ -169,9 +280,9 @@ def _new(quiz_module):
     
     Quiz = load_quiz(quiz_module) 
     
-    g.quiz_id = Quiz.create_new(get_shelve())
+    save_instance(Quiz())
     
-    return jsonify(dict(ID=g.quiz_id))
+    return jsonify(dict(ID=None if state_cookie() else g.quiz_id))
 
 
 @quiz_bp.route("/<quiz_module>/_next", methods=['GET', 'POST'])
@@ -182,6 +293,10 @@ def _next(quiz_module):
     
     Used by client side code to receive and respond to questions.
 
+    Maths is rendered in the format given by `?format=` (one of
+    `maths.FORMATS`, e.g. 'MathML' for clients that don't typeset
+    LaTeX themselves), by default the `DEFAULT_FORMAT`.
+
     On a valid GET request the response is in the format::
 
         {
@@ -235,9 +350,10 @@ def _next(quiz_module):
     if quiz_module not in quizzes.values():
         raise abort(404)
 
-    quiz_id = Cookie(request.cookies.get(COOKIE_QUIZ), False).data
-    if quiz_id is None:
-        raise BadRequestError("No Quiz ID!")
+    # The format maths is rendered in, see `maths.FORMATS`.
+    format_ = request.args.get('format', DEFAULT_FORMAT)
+    if format_ not in FORMATS:
+        raise BadRequestError("Unknown format!")
 
     json = None
     if request.method == 'POST':
@@ -246,11 +362,39 @@ def _next(quiz_module):
         if not isinstance(json, dict):
             raise BadRequestError("Expected json object.")
 
-    quiz = load_quiz(quiz_module).get_instance(get_shelve(), quiz_id)
-    resp = jsonify(quiz.next(json))
-
-    g.quiz_id = quiz.save(get_shelve())
-    return resp
+    # A GET request usually only reads the quiz, so start with the
+    # storage read only.
+    if request.method == 'GET':
+        quiz = load_instance(quiz_module, 'r')
+        loaded = quiz.to_state()
+        resp = quiz.next(json, format_)
+
+        if not quiz.modified and not expiring(quiz):
+            # Keep the cookie as it is.
+            g.quiz_id = quiz._id
+            return jsonify(resp)
+
+        if state_cookie():
+            # No one else can change the quiz.
+            save_instance(quiz)
+            return jsonify(resp)
+
+        # Save it holding its lock, as long as no one else changed it
+        # since it was read. Otherwise their changes would be lost.
+        with instance_locked():
+            if load_instance(quiz_module).to_state() == loaded:
+                save_instance(quiz)
+                return jsonify(resp)
+
+    # The quiz changes, so load it holding its lock. Otherwise another
+    # request could change it after it was read, only for those
+    # changes to be overwritten.
+    with instance_locked():
+        quiz = load_instance(quiz_module)
+        resp = quiz.next(json, format_)
+        save_instance(quiz)
+
+    return jsonify(resp)
 
 @quiz_bp.route("/<quiz_module>/finish", methods=['POST'])
 @quiz_cookie
@@ -271,28 +415,32 @@ def _finish(quiz_module):
     if quiz_module not in quizzes.values():
         raise abort(404)
 
-    quiz_id = Cookie(request.cookies.get(COOKIE_QUIZ), False).data
-    if quiz_id is None:
-        raise BadRequestError("No Quiz ID!")
-
-    quiz = load_quiz(quiz_module).get_instance(get_shelve(), quiz_id)
-    if not quiz.ended:
-        raise BadRequestError("Quiz not ended!")
-
     shelve = get_shelve()
 
+    if state_cookie():
+        quiz = load_instance(quiz_module)
+        if not quiz.ended:
+            raise BadRequestError("Quiz not ended!")
+
+        # Ended states can be sent again, but only finish once.
+        if not quiz.claim_finish(shelve):
+            raise BadRequestError("Quiz already finished!")
+    else:
+        # Removing the instance, while it's locked, is what keeps it
+        # from finishing twice.
+        with instance_locked():
+            try:
+                quiz = load_instance(quiz_module)
+            except KeyError:
+                raise BadRequestError("Quiz already finished!")
+
+            if not quiz.ended:
+                raise BadRequestError("Quiz not ended!")
+            quiz.remove(shelve)
 
     name = request.form.get('name', None)
     if name:
-        record = quiz.finish(name)
-        quiz_module = str(quiz_module)
-        records = shelve.get(quiz_module, [])
-
-        records.append(record)
-        records.sort(reverse=True)
-        shelve[quiz_module] = records
-
-    quiz.remove(shelve)
+        Leaderboard(shelve, quiz_module).add(quiz.finish(name))
 
     return redirect(url_for('root.index'))
 
@@ -8,11 +8,16 @@
 
 """
 
-from flask import (Blueprint, redirect, url_for, request,
-                   render_template)
+from datetime import datetime
+
+from flask import (Blueprint, redirect, url_for, request, abort,
+                   render_template, make_response, current_app,
+                   Response, jsonify)
 
 from ..quizzes import quizzes, quizzes_rev
+from ..leaderboard import Leaderboard, pages_cache
 from ..utils import get_shelve
+from ..errors import BadRequestError
 
 records_bp = Blueprint(
     'records', __name__,
@@ -42,7 +47,12 @@ def choose():
 @records_bp.route("/<quiz_module>")
 def view(quiz_module):
     """
-    View a quiz's records.
+    View a quiz's records, `RECORDS_PER_PAGE` at a time.
+
+    Rendered pages are cached until the records change. The page's
+    ETag and Last-Modified headers come from when the records last
+    changed, so a client that already has the page gets a 304 (Not
+    Modified) response without the records even being loaded.
 
     :param quiz_module: The name of the module in the `quizzes`
                         package where the `Quiz` class exists.
@@ -50,21 +60,115 @@ def view(quiz_module):
     :returns: The quiz's records page.
 
     :raises abort(404): When the requested `quiz_module` does not
-                        exist.
+                        exist (or the page does not).
     """
 
     # Check that the quiz exists.
     if quiz_module not in quizzes.values():
         raise abort(404)
 
-    quiz_module = str(quiz_module)
-    shelve = get_shelve()
-    if quiz_module not in shelve:
-        shelve[quiz_module] = []
-    records = shelve[quiz_module]
+    page = request.args.get('page', 1, type=int)
+    if page < 1:
+        raise abort(404)
+
+    leaderboard = Leaderboard(get_shelve('r'), quiz_module)
+    updated = leaderboard.updated
+    etag = page_etag(updated, page)
+
+    # The client's copy is still up to date.
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    cache = pages_cache()
+    cached = cache.get((quiz_module, page))
+
+    if cached is not None and cached[0] == updated:
+        html = cached[1]
+    else:
+        # The records may have changed since `updated` was read, so
+        # render from a copy read together with its own time.
+        top, updated = leaderboard.snapshot()
+        etag = page_etag(updated, page)
+        html = render_page(leaderboard, top, page)
+        cache[quiz_module, page] = (updated, html)
+
+    response = make_response(html)
+    response.set_etag(etag)
+    if updated is not None:
+        response.last_modified = datetime.utcfromtimestamp(updated)
+    # Always check the page is up to date before using a copy.
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
+
+@records_bp.route("/<quiz_module>/_rank")
+def _rank(quiz_module):
+    """
+    Rank a score against all of a quiz's records.
+
+    :param quiz_module: The name of the module in the `quizzes`
+                        package where the `Quiz` class exists.
+
+    :returns: JSON with the score's 'rank', 'percentile' and the
+              'total' number of records.
 
-    records_range = range(len(records))
-    quiz_name = quizzes_rev[quiz_module]
+    :raises abort(404): When the requested `quiz_module` does not
+                        exist.
+    :raises BadRequestError: When no (integer) score is given.
+    """
+    # Check that the quiz exists.
+    if quiz_module not in quizzes.values():
+        raise abort(404)
 
-    return render_template("view.html", **locals())
+    score = request.args.get('score', type=int)
+    if score is None:
+        raise BadRequestError("Expected score.")
 
+    shelve = get_shelve('r')
+    if Leaderboard(shelve, quiz_module).unindexed():
+        # Only ranking records from before there was an index writes,
+        # to count them.
+        shelve = get_shelve('c')
+
+    return jsonify(Leaderboard(shelve, quiz_module).rank(score))
+
+def page_etag(updated, page):
+    """
+    :param updated: When the records last changed (see
+                    `Leaderboard.updated`).
+    :param page: The page's number, starting at 1.
+
+    :returns: The ETag of the page of records.
+    """
+    return '{:f}-{}'.format(updated or 0, page)
+
+def render_page(leaderboard, top, page):
+    """
+    Render a page of records.
+
+    :param leaderboard: The quiz's `Leaderboard`.
+    :param top: The best records (see `Leaderboard.snapshot`).
+    :param page: The page's number, starting at 1.
+
+    :returns: The rendered page.
+
+    :raises abort(404): When there are no records on the page (and
+                        it's not the first page).
+    """
+    per_page = current_app.config['RECORDS_PER_PAGE']
+    records = leaderboard.page(page, per_page, top)
+
+    if not records and page != 1:
+        raise abort(404)
+
+    return render_template(
+        "view.html",
+        quiz_module=leaderboard.key,
+        quiz_name=quizzes_rev[leaderboard.key],
+        records=records,
+        start=(page - 1) * per_page,
+        page=page,
+        more=len(leaderboard.page(page + 1, per_page, top)) > 0
+    )
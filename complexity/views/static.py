@@ -0,0 +1,129 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: views/static.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Sending the static folder's files. Built bundles are named by a
+    hash of their contents, so they never change and are cached for
+    as long as possible. They're also sent precompressed when the
+    client accepts it.
+
+"""
+
+import os
+import re
+import gzip
+import time
+import mimetypes
+
+from flask import current_app, request, send_from_directory, safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Precompressed files' encodings and extensions, best first.
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Seconds fingerprinted files are cached for (a year, the longest
+# caches are meant to keep anything).
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def send_static(filename):
+    """
+    Send a file from the static folder, replacing the default
+    'static' view.
+
+    :param filename: The file's path in the static folder.
+
+    :returns: The file, precompressed if there's a precompressed
+              version the client accepts.
+    """
+    folder = current_app.static_folder
+    response = None
+
+    for encoding, extension in ENCODINGS:
+        if request.accept_encodings[encoding] <= 0:
+            continue
+        if not os.path.isfile(safe_join(folder, filename + extension)):
+            continue
+
+        response = send_from_directory(
+            folder, filename + extension,
+            mimetype=mimetypes.guess_type(filename)[0],
+            cache_timeout=current_app.get_send_file_max_age(filename)
+        )
+        response.content_encoding = encoding
+        break
+    else:
+        response = current_app.send_static_file(filename)
+
+    response.vary.add('Accept-Encoding')
+
+    if fingerprinted(filename):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.expires = int(time.time() + IMMUTABLE_MAX_AGE)
+        # Don't even check the file's up to date when reloading.
+        response.cache_control['immutable'] = None
+
+    return response
+
+def fingerprinted(filename):
+    """
+    :param filename: The file's path in the static folder.
+
+    :returns: True if `filename` is a bundle named by a hash of its
+              contents.
+    """
+    patterns = current_app.extensions.get('fingerprints')
+
+    if patterns is None:
+        assets = current_app.jinja_env.assets_environment
+        patterns = current_app.extensions['fingerprints'] = [
+            re.compile('^{}$'.format(
+                re.escape(bundle.output % dict(version='VERSION'))
+                .replace('VERSION', '[0-9a-f]+')
+            ))
+            for bundle in assets if '%(version)s' in bundle.output
+        ]
+
+    return any(pattern.match(filename) for pattern in patterns)
+
+def precompress(path):
+    """
+    Write compressed versions of a file next to it, one for each of
+    the `ENCODINGS` available (brotli is optional) that's smaller.
+
+    :param path: The file's path.
+
+    :returns: A `list` of the compressed files' paths.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    compressed = []
+
+    # No timestamp, so the same file always compresses the same.
+    with open(path + '.gz', 'wb') as f:
+        gzip_file = gzip.GzipFile(os.path.basename(path), 'wb', 9, f,
+                                  mtime=0)
+        gzip_file.write(data)
+        gzip_file.close()
+    compressed.append(path + '.gz')
+
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+        compressed.append(path + '.br')
+
+    # Compressing tiny files can make them bigger.
+    for compressed_path in list(compressed):
+        if os.path.getsize(compressed_path) >= len(data):
+            os.unlink(compressed_path)
+            compressed.remove(compressed_path)
+
+    return compressed
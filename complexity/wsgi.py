@@ -0,0 +1,18 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: wsgi.py
+    ~~~~~~~~~~~~~~~~~~~
+
+    The application for any WSGI server, e.g.
+
+        gunicorn --workers 4 complexity.wsgi:application
+
+    Every process the server starts has its own storage with the
+    'memory' backend, so only use it with a single process.
+
+"""
+
+from complexity import create_app
+
+application = create_app()
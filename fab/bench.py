@@ -0,0 +1,136 @@
+#!/usr/bin/env python2
+# -*- coding: UTF-8 -*-
+"""
+    Complexity: fab/bench.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Fabric file for benchmarking Complexity.
+
+    :copyright: (c) 2015 Luke Southam <luke@devthe.com>.
+    :license: New BSD, see LICENSE for more details.
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import multiprocessing
+from multiprocessing import Pool
+
+from fabric.api import task
+from fabric.colors import *
+
+from complexity import create_app
+
+QUIZ_URL = '/quiz/the_modulus/{}'
+
+# A wrong answer to every part, so no pattern is ever spotted.
+WRONG_ANSWER = json.dumps(dict(answer=[[-1, 1.0]] * 3))
+
+
+def _init_session(ready_, start_):
+    """
+    Share the semaphore each session releases once it's set up and
+    the event set to start them all at once.
+    """
+    global ready, start
+    ready, start = ready_, start_
+
+def _quiz_session(args):
+    """
+    Create a quiz and make `requests` requests to `_next`. Run in a
+    worker process.
+
+    Writing sessions POST answers, which saves the quiz under its
+    lock, and start a new quiz whenever one finishes. Reading
+    sessions only GET the question, e.g. the same as a user
+    refreshing.
+
+    :returns: The times the requests started and finished, so setting
+              up (e.g. creating the application) isn't measured.
+    """
+    config, write, requests = args
+    test_client = create_app(**config).test_client()
+    test_client.get(QUIZ_URL.format('_new'))
+    test_client.get(QUIZ_URL.format('_next'))
+
+    ready.release()
+    start.wait()
+
+    started = time.time()
+    for _ in xrange(requests):
+        if not write:
+            test_client.get(QUIZ_URL.format('_next'))
+            continue
+
+        response = test_client.post(
+            QUIZ_URL.format('_next'),
+            data=WRONG_ANSWER,
+            content_type='application/json'
+        )
+        if json.loads(response.data).get('finish'):
+            test_client.get(QUIZ_URL.format('_new'))
+    return started, time.time()
+
+def _throughput(config, write, sessions, requests):
+    """
+    :returns: `_next` requests per second for `sessions` concurrent
+              quiz sessions.
+    """
+    ready_ = multiprocessing.Semaphore(0)
+    start_ = multiprocessing.Event()
+    pool = Pool(sessions, _init_session, (ready_, start_))
+
+    result = pool.map_async(_quiz_session,
+                            [(config, write, requests)] * sessions)
+    for _ in xrange(sessions):
+        ready_.acquire()
+    start_.set()
+
+    times = result.get()
+    pool.close()
+    pool.join()
+
+    duration = max(end for _, end in times) - \
+        min(started for started, _ in times)
+    return sessions * requests / duration
+
+@task
+def storage(shards='1,2,4,8', sessions=8, requests=50):
+    """
+    Measure the throughput of the 'sharded' storage backend for each
+    number of `shards` (comma separated).
+
+    Answering questions (POST `_next`) writes, so the sessions wait
+    for each other's shard locks. It's reported alongside only
+    getting the question (GET `_next`), which just reads.
+    """
+    print magenta("Benchmarking sharded storage...")
+    print "{} CPU(s), {} session(s) requesting _next".format(
+        multiprocessing.cpu_count(), sessions
+    )
+    print "{:>12}  {:>14}  {:>14}".format(
+        '', 'write (POST)', 'read (GET)'
+    )
+
+    for count in map(int, shards.split(',')):
+        throughputs = []
+        for write in (True, False):
+            path = tempfile.mkdtemp()
+            try:
+                config = dict(
+                    STORAGE_BACKEND='sharded',
+                    SHELVE_SHARDS=count,
+                    SHELVE_FILENAME=path + '/complexity.bin'
+                )
+                throughputs.append(_throughput(
+                    config, write, int(sessions), int(requests)
+                ))
+            finally:
+                shutil.rmtree(path)
+
+        print "{:>3} shard(s): {:10.1f} req/s  {:10.1f} req/s".format(
+            count, *throughputs
+        )
+
+    print green("Done benchmarking!")
@@ -16,7 +16,7 @@ import uuid
 from fabric.api import task, local
 from fabric.colors import *
 
-from fab import pip
+from fab import pip, bench
 
 from complexity import create_app
 from complexity import command_line
@@ -30,6 +30,16 @@ def run():
 def debug():
     command_line.debug()
 
+@task
+def serve(*args):
+    command_line.serve(list(args))
+
+@task
+def build_assets():
+    print magenta("Building assets...")
+    command_line.build_assets()
+    print green("Done building assets!")
+
 @task
 def pyclean():
     print magenta("Cleaning python cache...")
@@ -62,11 +72,18 @@ def create_secrets():
 COOKIE_SECRET='{}'
 """.format(secrets_doc, cookie_secret))
 
+@task
+def sweep_storage():
+    print magenta("Sweeping expired quiz instances...")
+    command_line.sweep()
+    print green("Done sweeping storage.")
+
 @task
 def clean_storage():
     print magenta("Cleaning storage...")
 
     local('rm -f complexity.bin')
-    local('rm -f complexity.bin.lock')
+    local('rm -f complexity.bin.*')
+    local('rm -f complexity.sqlite complexity.sqlite-wal complexity.sqlite-shm')
 
     print green("Done cleaning storage.")
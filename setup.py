@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Command
 from setuptools.command.test import test as TestCommand
 import os
 import io
@@ -34,6 +34,20 @@ class PyTest(TestCommand):
         os.chdir(cwd)
         sys.exit(errcode)
 
+class BuildAssets(Command):
+    description = "compile, minify and hash the asset bundles"
+    user_options = []
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        from complexity import command_line
+        command_line.build_assets()
+
 setup(
     name='complexity',
     version='0.0.1',
@@ -42,7 +56,7 @@ setup(
     author='Luke Southam',
     tests_require=['pytest'],
     install_requires=requires,
-    cmdclass={'test': PyTest},
+    cmdclass={'test': PyTest, 'build_assets': BuildAssets},
     author_email='luke@devthe.com',
     description='Learn complex numbers, in a not so complex way!',
     long_description=long_description,
@@ -52,6 +66,14 @@ setup(
     test_suite='complexity.tests',
     extras_require={
         'testing': ['pytest'],
+        # Generates questions in batches (`complexity.batch`).
+        'batch': ['numpy'],
+        # Worker processes for `complexity-serve`, and green threads
+        # with `--async`.
+        'serve': ['gunicorn'],
+        'async': ['gunicorn', 'gevent'],
+        # Brotli compressed static files.
+        'brotli': ['brotli'],
     },
     package_data={
       'assets': 'complexity/assets/*',
@@ -61,6 +83,10 @@ setup(
         'console_scripts': [
             'complexity-run = complexity.command_line:run',
             'complexity-debug = complexity.command_line:debug',
+            'complexity-serve = complexity.command_line:serve',
+            'complexity-build-assets = '
+                'complexity.command_line:build_assets',
+            'complexity-sweep = complexity.command_line:sweep',
         ]
     }
 )